@@ -0,0 +1,24 @@
+"""Замеры производительности на синтетических каталогах."""
+
+from pathlib import Path
+
+from books import Status
+from filemanagers import JsonFileManager
+
+
+def make_catalog(filepath: Path, count: int) -> JsonFileManager:
+    """Создает файл каталога из `count` синтетических книг."""
+    statuses = [status.value for status in Status]
+    data = (
+        {
+            "id": id,
+            "title": f"Книга номер {id}",
+            "author": f"Автор {id % 1000}",
+            "year": 1800 + id % 220,
+            "status": statuses[id % len(statuses)],
+        }
+        for id in range(1, count + 1)
+    )
+    file_manager = JsonFileManager(filepath)
+    file_manager.save(list(data))
+    return file_manager
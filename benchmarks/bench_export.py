@@ -0,0 +1,38 @@
+"""
+Пропускная способность потокового экспорта каталога в CSV, JSON Lines
+и JSON.
+
+Запуск: python3 -m benchmarks.bench_export [количество книг]
+"""
+
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks import make_catalog
+from books import Book
+from exporters import export_books, exporters
+from libraries import LibraryManager
+
+
+def main(count: int) -> None:
+    with TemporaryDirectory() as directory:
+        directory = Path(directory)
+        file_manager = make_catalog(directory / "library.json", count)
+        library = LibraryManager(Book, file_manager)
+        print(f"Книг: {count}")
+        for export_format in exporters:
+            filepath = directory / f"export.{export_format}"
+            start = perf_counter()
+            export_books(library.iter_books(), filepath, export_format)
+            elapsed = perf_counter() - start
+            size = filepath.stat().st_size / 2**20
+            print(
+                f"{export_format}: {elapsed:.2f} с, "
+                f"{count / elapsed:,.0f} книг/с, {size / elapsed:.1f} МБ/с"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,69 @@
+"""
+Ускорение поиска в рабочих процессах в зависимости от их количества.
+
+Запуск: python3 -m benchmarks.bench_parallel [количество книг]
+"""
+
+import os
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks import make_catalog
+from books import Book, Status
+from libraries import LibraryManager
+
+queries = (
+    ("title", "номер 12345"),
+    ("author", "автор 42"),
+    ("year", 1900),
+    ("status", Status.BORROWED.value),
+)
+repeat = 5
+
+
+def measure(library: LibraryManager) -> float:
+    """Среднее время серии запросов в секундах."""
+    start = perf_counter()
+    for _ in range(repeat):
+        for field_name, query in queries:
+            if field_name == "status":
+                library.get_books_by_status(query)
+            else:
+                library.search_book(field_name, query)
+    return (perf_counter() - start) / repeat
+
+
+def main(count: int) -> None:
+    cores = os.cpu_count() or 1
+    # На одноядерной машине замер с двумя процессами показывает накладные
+    # расходы на обмен с процессами
+    workers = sorted(
+        {max(cores, 2)} | {2**n for n in range(1, 8) if 2**n < cores}
+    )
+    with TemporaryDirectory() as directory:
+        file_manager = make_catalog(Path(directory) / "library.json", count)
+        library = LibraryManager(Book, file_manager)
+        library.search_workers = 1
+        baseline = measure(library)
+        print(f"Книг: {count}, ядер: {cores}")
+        print(f"1 процесс: {baseline * 1000:.1f} мс на серию запросов")
+        for number in workers:
+            library.parallel_threshold = 0
+            library.search_workers = number
+            start = perf_counter()
+            library.search_book("year", 0)
+            started = perf_counter() - start
+            elapsed = measure(library)
+            print(
+                f"{number} процессов: {elapsed * 1000:.1f} мс, "
+                f"ускорение {baseline / elapsed:.2f}x "
+                f"(запуск процессов {started:.2f} с)"
+            )
+            library._parallel.close()
+            library._parallel = None
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
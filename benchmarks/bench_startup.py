@@ -0,0 +1,37 @@
+"""
+Время запуска: холодная загрузка каталога (разбор JSON и валидация книг)
+против теплой (чтение снимка) и ленивого открытия по индексу.
+
+Запуск: python3 -m benchmarks.bench_startup [количество книг]
+"""
+
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks import make_catalog
+from books import Book
+from libraries import LibraryManager
+
+
+def measure(file_manager, lazy: bool = False) -> float:
+    start = perf_counter()
+    LibraryManager(Book, file_manager, lazy=lazy)
+    return perf_counter() - start
+
+
+def main(count: int) -> None:
+    with TemporaryDirectory() as directory:
+        file_manager = make_catalog(Path(directory) / "library.json", count)
+        cold = measure(file_manager)
+        warm = measure(file_manager)
+        lazy = measure(file_manager, lazy=True)
+    print(f"Книг: {count}")
+    print(f"Холодный запуск: {cold:.3f} с")
+    print(f"Теплый запуск (снимок): {warm:.3f} с")
+    print(f"Ленивый запуск (индекс): {lazy:.3f} с")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,56 @@
+"""
+Память на книгу и время поиска для словарного и колоночного
+хранилищ книг.
+
+Запуск: python3 -m benchmarks.bench_stores [количество книг]
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks import make_catalog
+from books import Book, Status
+from libraries import LibraryManager
+from stores import stores
+
+queries = (
+    ("year", 1900),
+    ("author", "автор 42"),
+    ("title", "номер 12345"),
+)
+
+
+def main(count: int) -> None:
+    with TemporaryDirectory() as directory:
+        file_manager = make_catalog(Path(directory) / "library.json", count)
+        # Снимок создается заранее, чтобы не попасть в замер памяти
+        LibraryManager(Book, file_manager)
+        print(f"Книг: {count}")
+        for name, store_class in stores.items():
+            tracemalloc.start()
+            library = LibraryManager(
+                Book, file_manager, store_class=store_class
+            )
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            print(f"\n{name}: {size / count:.0f} байт на книгу")
+            for field_name, query in queries:
+                start = perf_counter()
+                found = len(library.search_book(field_name, query))
+                elapsed = perf_counter() - start
+                print(
+                    f"  {field_name}={query!r}: {elapsed * 1000:.1f} мс, "
+                    f"найдено {found}"
+                )
+            start = perf_counter()
+            found = len(library.get_books_by_status(Status.BORROWED.value))
+            elapsed = perf_counter() - start
+            print(f"  status: {elapsed * 1000:.1f} мс, найдено {found}")
+            del library
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -1,6 +1,9 @@
-from dataclasses import asdict, dataclass, field
+import unicodedata
+from dataclasses import dataclass, field, fields
 from datetime import date
 from enum import Enum
+from functools import cache
+from typing import ClassVar
 
 
 class Status(Enum):
@@ -10,10 +13,21 @@ class Status(Enum):
     BORROWED: str = "выдана"
 
 
+def normalize_text(value: str) -> str:
+    """
+    Нормализация строки для сравнения и поиска: приведение к форме NFC,
+    casefold и замена `ё` на `е`.
+    """
+    return unicodedata.normalize("NFC", value).casefold().replace("ё", "е")
+
+
 @dataclass
 class Book:
     """Класс книг."""
 
+    # Поля, для которых хранятся нормализованные ключи `<поле>_key`
+    normalized_fields: ClassVar[tuple[str, ...]] = ("title", "author")
+
     id: int = field(compare=False)
     title: str
     author: str
@@ -46,6 +60,18 @@ class Book:
                 f"{', '.join(s.value for s in Status)}"
             )
 
+        # Ключи вычисляются один раз для проверенных значений
+        for name in self.normalized_fields:
+            self.__dict__[f"{name}_key"] = normalize_text(getattr(self, name))
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # До конца __post_init__ ключей еще нет: их вычисляет он сам
+        key_name = f"{name}_key"
+        if name in self.normalized_fields and key_name in self.__dict__:
+            key = normalize_text(value) if isinstance(value, str) else None
+            super().__setattr__(key_name, key)
+
     def __str__(self):
         return (
             f"id: {self.id}\n"
@@ -60,14 +86,16 @@ class Book:
         if not isinstance(other, Book):
             return NotImplemented
         return (
-            self.title.lower() == other.title.lower()
-            and self.author.lower() == other.author.lower()
+            self.title_key == other.title_key
+            and self.author_key == other.author_key
             and self.year == other.year
         )
 
     def to_dict(self) -> dict[str, str | int]:
         """Преобразование объекта в словарь."""
-        return asdict(self)
+        # Поля книги не содержат вложенных объектов, поэтому копирование
+        # через asdict не требуется
+        return {name: getattr(self, name) for name in self.field_names()}
 
     @classmethod
     def from_dict(cls, data: dict[str, str | int]) -> "Book":
@@ -80,6 +108,42 @@ class Book:
             status=data.get("status", Status.AVAILABLE.value),
         )
 
+    def to_record(self) -> tuple[str | int, ...]:
+        """Преобразование объекта в кортеж значений полей."""
+        return tuple(getattr(self, name) for name in self.field_names())
+
+    @classmethod
+    def from_record(
+        cls,
+        record: tuple[str | int, ...],
+        keys: dict[str, str] | None = None,
+    ) -> "Book":
+        """
+        Классовый метод для создания объекта из кортежа, полученного
+        методом `to_record`. Значения уже проверены, поэтому валидация
+        не выполняется. Готовые нормализованные ключи можно передать
+        в `keys`, чтобы не вычислять их заново.
+        """
+        book = cls.__new__(cls)
+        attributes = book.__dict__
+        attributes.update(zip(cls.field_names(), record))
+        for name in cls.normalized_fields:
+            key = keys[name] if keys else normalize_text(attributes[name])
+            attributes[f"{name}_key"] = key
+        return book
+
+    def search_value(self, field_name: str) -> str | int:
+        """Значение поля для сравнения: нормализованный ключ или само поле."""
+        if field_name in self.normalized_fields:
+            return getattr(self, f"{field_name}_key")
+        return getattr(self, field_name)
+
+    @classmethod
+    @cache
+    def field_names(cls) -> tuple[str, ...]:
+        """Имена полей класса в порядке объявления."""
+        return tuple(f.name for f in fields(cls))
+
     @staticmethod
     def validate_non_empty_string(field_name: str, value: str) -> str:
         """Валидатор проверяет, что атрибут является непустой строкой."""
@@ -88,3 +152,39 @@ class Book:
                 f"Поле {field_name} должно быть непустой строкой."
             )
         return value.strip()
+
+
+@dataclass
+class Loan:
+    """Выдача книги читателю."""
+
+    book_id: int
+    borrower: str
+    borrowed_at: date
+    due_date: date
+
+    def __post_init__(self):
+        self.borrower = Book.validate_non_empty_string(
+            "borrower", self.borrower
+        )
+        if self.due_date < self.borrowed_at:
+            raise ValueError("Срок возврата не может быть раньше выдачи.")
+
+    def to_dict(self) -> dict[str, str | int]:
+        """Преобразование объекта в словарь с датами в формате ISO."""
+        return {
+            "book_id": self.book_id,
+            "borrower": self.borrower,
+            "borrowed_at": self.borrowed_at.isoformat(),
+            "due_date": self.due_date.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str | int]) -> "Loan":
+        """Классовый метод для создания объекта из словаря."""
+        return cls(
+            book_id=data["book_id"],
+            borrower=data["borrower"],
+            borrowed_at=date.fromisoformat(data["borrowed_at"]),
+            due_date=date.fromisoformat(data["due_date"]),
+        )
@@ -0,0 +1,336 @@
+import argparse
+import json
+import shlex
+import sys
+from datetime import date
+from json import JSONDecodeError
+from typing import Any, TextIO
+
+from books import Book, Loan, Status
+from exporters import export_books, exporters
+from filemanagers import JsonFileManager
+from libraries import LibraryManager
+from replicas import ReplicaLibraryManager
+from stores import stores
+
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+# Наибольшее число ID в одном списке: диапазон проверяется до того,
+# как он развернут в список
+max_ids: int = 100_000
+
+
+class CommandParser(argparse.ArgumentParser):
+    """Парсер команд скрипта: ошибка разбора не завершает программу."""
+
+    def error(self, message: str):
+        raise ValueError(message)
+
+
+def parse_ids(value: str) -> list[int]:
+    """Разбор списка ID через запятую, допускаются диапазоны `1-5`."""
+    ids = []
+    for part in value.split(","):
+        start, _, stop = part.strip().partition("-")
+        try:
+            first = int(start)
+            last = int(stop) if stop else first
+        except ValueError as error:
+            raise ValueError(
+                "Ввод должен быть списком чисел или диапазонов."
+            ) from error
+        if first > last:
+            raise ValueError(f"Неверный диапазон `{part.strip()}`.")
+        if len(ids) + last - first + 1 > max_ids:
+            raise ValueError(f"Можно указать не больше {max_ids} ID.")
+        ids.extend(range(first, last + 1))
+    return ids
+
+
+def parse_status(value: str) -> str:
+    """Статус по значению (`выдана`) или имени (`borrowed`)."""
+    for status in Status:
+        if value.strip().lower() in (status.name.lower(), status.value):
+            return status.value
+    raise argparse.ArgumentTypeError(f"Статус `{value}` не поддерживается.")
+
+
+def parse_query(field: str, query: str) -> str | int:
+    """Значение для поиска: для поля year ожидается число."""
+    if field != "year":
+        return query
+    try:
+        return int(query)
+    except ValueError as error:
+        raise ValueError("Ввод должен быть числом.") from error
+
+
+def list_books(library: LibraryManager, args: argparse.Namespace):
+    return library.iter_books()
+
+
+def get_book(library: LibraryManager, args: argparse.Namespace):
+    return library.get_book(args.id)
+
+
+def add_book(library: LibraryManager, args: argparse.Namespace):
+    return library.add_book(args.title, args.author, args.year)
+
+
+def delete_book(library: LibraryManager, args: argparse.Namespace):
+    return library.delete_book(args.id)
+
+
+def update_status(library: LibraryManager, args: argparse.Namespace):
+    return library.update_book_status(
+        args.id, args.status, args.borrower, args.due
+    )
+
+
+def search_books(library: LibraryManager, args: argparse.Namespace):
+    query = parse_query(args.field, args.query)
+    return library.iter_search_book(args.field, query)
+
+
+def suggest(library: LibraryManager, args: argparse.Namespace):
+    return library.suggest(args.field, args.prefix, args.limit)
+
+
+def sorted_books(library: LibraryManager, args: argparse.Namespace):
+    return library.get_sorted_books(
+        args.field, args.reverse, args.offset, args.limit
+    )
+
+
+def update_statuses(library: LibraryManager, args: argparse.Namespace):
+    updated_books, errors = library.update_books_status(
+        [(book_id, args.status) for book_id in parse_ids(args.ids)],
+        args.borrower,
+        args.due,
+    )
+    return {"updated": [book.id for book in updated_books], "errors": errors}
+
+
+def export_catalog(library: LibraryManager, args: argparse.Namespace):
+    if args.field:
+        query = parse_query(args.field, args.query or "")
+        books = library.iter_search_book(args.field, query)
+    else:
+        books = library.iter_books()
+    count = export_books(books, args.filename, args.format)
+    return {"file": args.filename, "count": count}
+
+
+def overdue_loans(library: LibraryManager, args: argparse.Namespace):
+    return library.overdue_loans()
+
+
+def due_loans(library: LibraryManager, args: argparse.Namespace):
+    return library.due_loans(args.days)
+
+
+def replication_lag(library: LibraryManager, args: argparse.Namespace):
+    if not isinstance(library, ReplicaLibraryManager):
+        raise ValueError("Команда доступна только в режиме --replica.")
+    return library.replication_lag()
+
+
+def add_loan_arguments(command: argparse.ArgumentParser) -> None:
+    """Аргументы выдачи книги читателю."""
+    command.add_argument("--borrower", help="Читатель, которому выдана книга")
+    command.add_argument(
+        "--due", type=date.fromisoformat, help="Срок возврата, ГГГГ-ММ-ДД"
+    )
+
+
+def add_commands(subparsers: argparse._SubParsersAction) -> None:
+    """Добавляет команды, соответствующие пунктам меню."""
+    command = subparsers.add_parser("list", help="Показать все книги")
+    command.set_defaults(handler=list_books)
+
+    command = subparsers.add_parser("get", help="Получить книгу по ID")
+    command.add_argument("id", type=int)
+    command.set_defaults(handler=get_book)
+
+    command = subparsers.add_parser("add", help="Добавить книгу")
+    command.add_argument("title")
+    command.add_argument("author")
+    command.add_argument("year", type=int)
+    command.set_defaults(handler=add_book)
+
+    command = subparsers.add_parser("delete", help="Удалить книгу")
+    command.add_argument("id", type=int)
+    command.set_defaults(handler=delete_book)
+
+    command = subparsers.add_parser("status", help="Изменить статус книги")
+    command.add_argument("id", type=int)
+    command.add_argument("status", type=parse_status)
+    add_loan_arguments(command)
+    command.set_defaults(handler=update_status)
+
+    command = subparsers.add_parser("search", help="Найти книгу")
+    command.add_argument("field", choices=LibraryManager.search_fields)
+    command.add_argument("query")
+    command.set_defaults(handler=search_books)
+
+    command = subparsers.add_parser(
+        "suggest", help="Варианты автодополнения названия или автора"
+    )
+    command.add_argument("field", choices=LibraryManager.suggest_fields)
+    command.add_argument("prefix")
+    command.add_argument("--limit", type=int, default=10)
+    command.set_defaults(handler=suggest)
+
+    command = subparsers.add_parser(
+        "sorted", help="Показать книги по порядку"
+    )
+    command.add_argument("field", choices=LibraryManager.sort_fields)
+    command.add_argument("--reverse", action="store_true")
+    command.add_argument("--offset", type=int, default=0)
+    command.add_argument("--limit", type=int)
+    command.set_defaults(handler=sorted_books)
+
+    command = subparsers.add_parser(
+        "bulk-status", help="Изменить статус нескольких книг"
+    )
+    command.add_argument("ids", help="ID через запятую, например 1,3,5-8")
+    command.add_argument("status", type=parse_status)
+    add_loan_arguments(command)
+    command.set_defaults(handler=update_statuses)
+
+    command = subparsers.add_parser("export", help="Экспорт книг")
+    command.add_argument("format", choices=tuple(exporters))
+    command.add_argument("filename")
+    command.add_argument("--field", choices=LibraryManager.search_fields)
+    command.add_argument("--query")
+    command.set_defaults(handler=export_catalog)
+
+    command = subparsers.add_parser("overdue", help="Просроченные книги")
+    command.set_defaults(handler=overdue_loans)
+
+    command = subparsers.add_parser(
+        "due", help="Книги, которые нужно вернуть в ближайшие дни"
+    )
+    command.add_argument("days", type=int)
+    command.set_defaults(handler=due_loans)
+
+    command = subparsers.add_parser("lag", help="Отставание реплики")
+    command.set_defaults(handler=replication_lag)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Парсер аргументов неинтерактивного режима."""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Неинтерактивный режим управления библиотекой.",
+    )
+    parser.add_argument("--file", default="library.json")
+    parser.add_argument(
+        "--store",
+        choices=tuple(stores),
+        default="dict",
+        help="Хранилище книг в памяти",
+    )
+    parser.add_argument(
+        "--replica",
+        action="store_true",
+        help="Реплика только для чтения, следующая за журналом изменений",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_commands(subparsers)
+    command = subparsers.add_parser(
+        "script", help="Выполнить команды из файла или stdin"
+    )
+    command.add_argument("script", nargs="?", default="-")
+    return parser
+
+
+def to_json(result: Any) -> Any:
+    """Преобразование результата команды в данные JSON."""
+    if isinstance(result, (Book, Loan)):
+        return result.to_dict()
+    if isinstance(result, (dict, str, int)) or result is None:
+        return result
+    return [to_json(item) for item in result]
+
+
+def execute(
+    library: LibraryManager,
+    args: argparse.Namespace,
+    output: TextIO,
+    **extra: Any,
+) -> bool:
+    """Выполняет команду и печатает результат одной строкой JSON."""
+    response = {"command": args.command, **extra}
+    try:
+        response["result"] = to_json(args.handler(library, args))
+        response["ok"] = True
+    except (ValueError, OSError) as error:
+        response["ok"] = False
+        response["error"] = str(error)
+    output.write(_encode(response) + "\n")
+    return response["ok"]
+
+
+def run_script(library: LibraryManager, lines: TextIO, output: TextIO) -> bool:
+    """
+    Выполняет команды скрипта, по одной на строку. Реплика перед каждой
+    командой применяет новые изменения основного процесса.
+    """
+    parser = CommandParser(prog="script")
+    add_commands(parser.add_subparsers(dest="command", required=True))
+    success = True
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            args = parser.parse_args(shlex.split(line))
+        except ValueError as error:
+            response = {"line": number, "ok": False, "error": str(error)}
+            output.write(_encode(response) + "\n")
+            success = False
+            continue
+        if isinstance(library, ReplicaLibraryManager):
+            library.sync()
+        success &= execute(library, args, output, line=number)
+    return success
+
+
+def run(
+    argv: list[str],
+    stdin: TextIO = sys.stdin,
+    output: TextIO = sys.stdout,
+) -> int:
+    """
+    Неинтерактивный режим: каталог загружается один раз, все команды
+    выполняются в одном процессе, изменения сохраняются один раз в конце
+    и публикуются в журнал изменений для реплик. Возвращает код
+    завершения.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        if args.replica:
+            library = ReplicaLibraryManager(
+                Book, JsonFileManager(args.file), stores[args.store]
+            )
+        else:
+            library = LibraryManager(
+                Book,
+                JsonFileManager(args.file),
+                lazy=True,
+                store_class=stores[args.store],
+                publish_changes=True,
+            )
+        with library.deferred_save():
+            if args.command != "script":
+                success = execute(library, args, output)
+            elif args.script == "-":
+                success = run_script(library, stdin, output)
+            else:
+                with open(args.script, encoding="utf-8") as lines:
+                    success = run_script(library, lines, output)
+    except (OSError, JSONDecodeError) as error:
+        output.write(_encode({"ok": False, "error": str(error)}) + "\n")
+        return 1
+    return 0 if success else 1
+
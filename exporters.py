@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from books import Book
+from filemanagers import format_record
+
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+class Exporter(ABC):
+    """
+    Потоковая выгрузка книг. Книги сериализуются по одной, поэтому
+    в памяти одновременно находится не больше одной записи.
+    """
+
+    @abstractmethod
+    def serialize(self, books: Iterable[Book]) -> Iterator[str]:
+        pass
+
+    def export(self, books: Iterable[Book], filepath: str | Path) -> int:
+        """Записывает книги в файл и возвращает их количество."""
+        counter = _Counter(books)
+        with Path(filepath).open("w", encoding="utf-8", newline="") as file:
+            for chunk in self.serialize(counter):
+                file.write(chunk)
+        return counter.count
+
+
+class CsvExporter(Exporter):
+    def serialize(self, books: Iterable[Book]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(Book.field_names())
+        for book in books:
+            writer.writerow(book.to_record())
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+
+class JsonLinesExporter(Exporter):
+    def serialize(self, books: Iterable[Book]) -> Iterator[str]:
+        for book in books:
+            yield _encode(book.to_dict()) + "\n"
+
+
+class JsonExporter(Exporter):
+    def serialize(self, books: Iterable[Book]) -> Iterator[str]:
+        # Формат совпадает с файлом каталога: json.dump(indent=4)
+        yield "["
+        number = -1
+        for number, book in enumerate(books):
+            yield ",\n    " if number else "\n    "
+            yield format_record(book.to_dict())
+        yield "\n]" if number >= 0 else "]"
+
+
+class _Counter:
+    """Итератор-обертка, считающий выданные элементы."""
+
+    def __init__(self, items: Iterable):
+        self._items = iter(items)
+        self.count = 0
+
+    def __iter__(self) -> "_Counter":
+        return self
+
+    def __next__(self):
+        item = next(self._items)
+        self.count += 1
+        return item
+
+
+exporters: dict[str, type[Exporter]] = {
+    "csv": CsvExporter,
+    "jsonl": JsonLinesExporter,
+    "json": JsonExporter,
+}
+
+
+def export_books(
+    books: Iterable[Book], filepath: str | Path, export_format: str
+) -> int:
+    """Выгружает книги в файл в указанном формате."""
+    exporter_class = exporters.get(export_format)
+    if exporter_class is None:
+        raise ValueError(
+            f"Формат экспорта `{export_format}` не поддерживается."
+        )
+    return exporter_class().export(books, filepath)
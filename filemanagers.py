@@ -1,9 +1,67 @@
+import hashlib
 import json
+import marshal
+import os
+import time
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
 from pathlib import Path
 from typing import Any
 
 
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def format_record(item: dict[str, str | int]) -> str:
+    """
+    Форматирует плоскую запись так же, как элемент списка в выводе
+    json.dump(indent=4), без медленного кодировщика с отступами.
+    """
+    if not item:
+        return "{}"
+    fields = ",\n        ".join(
+        f"{_encode(key)}: {_encode(value)}" for key, value in item.items()
+    )
+    return "{\n        " + fields + "\n    }"
+
+
+class RecordIndex:
+    """Индекс смещений записей в файле: id -> (начало, конец) в байтах."""
+
+    def __init__(
+        self, ids: array, starts: array, ends: array, next_id: int
+    ) -> None:
+        self.ids = ids
+        self.starts = starts
+        self.ends = ends
+        self.next_id = next_id
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def get(self, id: int) -> tuple[int, int] | None:
+        """Возвращает границы записи с указанным id."""
+        position = bisect_left(self.ids, id)
+        if position == len(self.ids) or self.ids[position] != id:
+            return None
+        return self.starts[position], self.ends[position]
+
+    @classmethod
+    def from_offsets(
+        cls, offsets: list[tuple[int, int, int]]
+    ) -> "RecordIndex":
+        """Создает индекс из списка троек (id, начало, конец)."""
+        offsets.sort()
+        ids, starts, ends = array("q"), array("q"), array("q")
+        for id, start, end in offsets:
+            ids.append(id)
+            starts.append(start)
+            ends.append(end)
+        next_id = ids[-1] + 1 if ids else 1
+        return cls(ids, starts, ends, next_id)
+
+
 class FileManager(ABC):
     @abstractmethod
     def load(self) -> dict[str, Any]:
@@ -13,10 +71,84 @@ class FileManager(ABC):
     def save(self, data):
         pass
 
+    def load_index(self) -> RecordIndex | None:
+        """
+        Индекс записей для ленивой загрузки, если хранилище его ведет.
+        Хранилище с индексом переопределяет и `load_record`.
+        """
+        return None
+
+    def load_record(self, start: int, end: int) -> dict[str, Any] | None:
+        """
+        Загружает одну запись по её границам из индекса `load_index`.
+        None означает, что отдельные записи не читаются и каталог
+        загружается целиком.
+        """
+        return None
+
+    def load_loans(self) -> list[dict[str, Any]]:
+        """Загружает записи о выдаче книг."""
+        return []
+
+    def save_loans(self, data: list[dict[str, Any]]) -> None:
+        """Сохраняет записи о выдаче книг."""
+
+    def load_snapshot(self, tag: str) -> Any | None:
+        """Загружает снимок разобранных данных, если он актуален.
+
+        Снимок состоит из простых типов (списки, кортежи, строки, числа).
+        """
+        return None
+
+    def load_with_snapshot_key(
+        self, tag: str
+    ) -> tuple[list[dict[str, Any]], Any | None]:
+        """
+        Загружает данные вместе с ключом снимка, вычисленным по тем же
+        данным. None вместо ключа означает, что снимки не ведутся.
+        """
+        return self.load(), None
+
+    def save_snapshot(self, key: Any | None, payload: Any) -> None:
+        """Сохраняет снимок данных под ключом из `load_with_snapshot_key`."""
+
+    def append_changes(self, records: list[dict[str, Any]]) -> None:
+        """Дописывает записи об изменениях в журнал для реплик."""
+
+    def read_changes(
+        self, offset: int = 0, generation: int | None = None
+    ) -> tuple[dict[str, Any] | None, list[dict[str, Any]], int]:
+        """
+        Читает записи журнала изменений, начиная со смещения `offset`.
+        Если задано поколение `generation`, а журнал уже другого
+        поколения, смещение относится к прежнему журналу и записи
+        читаются с начала. Возвращает заголовок журнала (None, если
+        журнала нет), записи и смещение, с которого продолжать чтение.
+        """
+        return None, [], offset
+
+    def reset_changes(self, seq: int) -> None:
+        """Начинает новый журнал изменений после записи номер `seq`."""
+
 
 class JsonFileManager(FileManager):
+    index_version: int = 1
+    snapshot_version: int = 1
+
     def __init__(self, filename: str):
         self.filepath = Path(__file__).parent / filename
+        self.index_filepath = self.filepath.with_name(
+            self.filepath.name + ".idx"
+        )
+        self.snapshot_filepath = self.filepath.with_name(
+            self.filepath.name + ".cache"
+        )
+        self.loans_filepath = self.filepath.with_name(
+            self.filepath.stem + ".loans.json"
+        )
+        self.changes_filepath = self.filepath.with_name(
+            self.filepath.name + ".changes"
+        )
 
     def load(self) -> list[dict[str, str | int]]:
         try:
@@ -36,5 +168,258 @@ class JsonFileManager(FileManager):
 
     def save(self, data: list[dict[str, str | int]]) -> None:
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
-        with self.filepath.open("w", encoding="utf-8") as file:
+        offsets = []
+        # Файл пишется рядом и подменяется целиком, чтобы другие процессы
+        # (реплики) никогда не читали наполовину записанный каталог.
+        temp_filepath = self.filepath.with_name(self.filepath.name + ".tmp")
+        # Записи пишутся по одной в том же формате, что и json.dump(indent=4),
+        # попутно запоминаются их смещения для индекса.
+        with temp_filepath.open("wb") as file:
+            file.write(b"[")
+            for number, item in enumerate(data):
+                file.write(b",\n    " if number else b"\n    ")
+                start = file.tell()
+                file.write(format_record(item).encode("utf-8"))
+                offsets.append((item["id"], start, file.tell()))
+            file.write(b"\n]" if data else b"]")
+        os.replace(temp_filepath, self.filepath)
+        self._save_index(RecordIndex.from_offsets(offsets))
+
+    def load_loans(self) -> list[dict[str, str | int]]:
+        """Загружает записи о выдаче; отсутствующий файл означает их нет."""
+        try:
+            with self.loans_filepath.open(encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return []
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(
+                f"Ошибка чтения JSON файла {self.loans_filepath}", e.doc, e.pos
+            ) from e
+
+    def save_loans(self, data: list[dict[str, str | int]]) -> None:
+        with self.loans_filepath.open("w", encoding="utf-8") as file:
             json.dump(data, file, ensure_ascii=False, indent=4)
+
+    def load_index(self) -> RecordIndex:
+        """
+        Загружает индекс смещений записей. Если индекс отсутствует или
+        устарел, перестраивает его по файлу данных.
+        """
+        self._fingerprint()
+        index = self._read_index()
+        if index is None:
+            index = RecordIndex.from_offsets(self._scan_offsets())
+            self._save_index(index)
+        return index
+
+    def load_record(self, start: int, end: int) -> dict[str, str | int]:
+        with self.filepath.open("rb") as file:
+            file.seek(start)
+            return json.loads(file.read(end - start))
+
+    def load_snapshot(self, tag: str) -> Any | None:
+        """
+        Загружает снимок, сохраненный для текущего содержимого файла данных.
+        Снимок действителен, только если совпадают размер, время изменения
+        и хеш файла, а также тег формата данных.
+        """
+        try:
+            with self.filepath.open("rb") as data_file:
+                stat = os.fstat(data_file.fileno())
+                digest = hashlib.blake2b()
+                while chunk := data_file.read(1 << 20):
+                    digest.update(chunk)
+            expected = self._snapshot_header(tag, stat, digest)
+            with self.snapshot_filepath.open("rb") as file:
+                header = json.loads(file.readline())
+                if header != expected:
+                    return None
+                return marshal.loads(file.read())
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+
+    def load_with_snapshot_key(
+        self, tag: str
+    ) -> tuple[list[dict[str, str | int]], dict[str, str | int]]:
+        """
+        Читает файл данных один раз: ключ снимка (размер и время изменения
+        открытого файла, хеш прочитанных байтов) соответствует именно
+        разобранным данным, даже если файл тем временем заменили.
+        """
+        try:
+            with self.filepath.open("rb") as file:
+                stat = os.fstat(file.fileno())
+                raw = file.read()
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Файл {self.filepath} не найден!") from e
+        key = self._snapshot_header(tag, stat, hashlib.blake2b(raw))
+        return self._decode(raw), key
+
+    def save_snapshot(
+        self, key: dict[str, str | int] | None, payload: Any
+    ) -> None:
+        """
+        Записывает снимок во временный файл и подменяет им прежний: снимок
+        могут одновременно записывать основной процесс и реплики.
+        """
+        if key is None:
+            return
+        temp_filepath = self.snapshot_filepath.with_name(
+            f"{self.snapshot_filepath.name}.{os.getpid()}.tmp"
+        )
+        with temp_filepath.open("wb") as file:
+            file.write(json.dumps(key).encode("utf-8") + b"\n")
+            file.write(marshal.dumps(payload))
+        os.replace(temp_filepath, self.snapshot_filepath)
+
+    def append_changes(self, records: list[dict[str, Any]]) -> None:
+        """
+        Дописывает записи в журнал изменений, по одной строке JSON.
+        Строка без перевода строки в конце считается недописанной.
+        """
+        if not self.changes_filepath.exists():
+            self.reset_changes(0)
+        lines = "".join(_encode(record) + "\n" for record in records)
+        with self.changes_filepath.open("ab") as file:
+            file.write(lines.encode("utf-8"))
+
+    def read_changes(
+        self, offset: int = 0, generation: int | None = None
+    ) -> tuple[dict[str, Any] | None, list[dict[str, Any]], int]:
+        """
+        Читает журнал изменений. Первая строка журнала - заголовок с
+        поколением журнала и номером последней записи до его начала.
+        """
+        try:
+            with self.changes_filepath.open("rb") as file:
+                line = file.readline()
+                if not line.endswith(b"\n"):
+                    return None, [], offset
+                header = json.loads(line)
+                if generation is not None and (
+                    header["generation"] != generation
+                ):
+                    offset = 0
+                offset = max(offset, file.tell())
+                file.seek(offset)
+                data = file.read()
+        except FileNotFoundError:
+            return None, [], offset
+        complete = data.rfind(b"\n") + 1
+        records = [
+            json.loads(line) for line in data[:complete].splitlines() if line
+        ]
+        return header, records, offset + complete
+
+    def reset_changes(self, seq: int) -> None:
+        """
+        Заменяет журнал пустым журналом нового поколения. Реплика, которая
+        читала прежний журнал, по смене поколения загружает каталог заново.
+        """
+        header = {"generation": time.time_ns(), "seq": seq}
+        temp_filepath = self.changes_filepath.with_name(
+            self.changes_filepath.name + ".tmp"
+        )
+        with temp_filepath.open("wb") as file:
+            file.write(json.dumps(header).encode("utf-8") + b"\n")
+        os.replace(temp_filepath, self.changes_filepath)
+
+    def _snapshot_header(
+        self, tag: str, stat: os.stat_result, digest: Any
+    ) -> dict[str, str | int]:
+        """Ключ снимка: версия, тег, размер, время изменения и хеш данных."""
+        return {
+            "version": self.snapshot_version,
+            "tag": tag,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": digest.hexdigest(),
+        }
+
+    def _decode(self, raw: bytes) -> list[dict[str, str | int]]:
+        """Разбирает содержимое файла данных; пустой файл - пустой список."""
+        if not raw:
+            return []
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(
+                f"Ошибка чтения JSON файла {self.filepath}", e.doc, e.pos
+            ) from e
+
+    def _fingerprint(self) -> dict[str, int]:
+        """Размер и время изменения файла данных."""
+        try:
+            stat = self.filepath.stat()
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Файл {self.filepath} не найден!") from e
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _read_index(self) -> RecordIndex | None:
+        """Читает индекс, если он соответствует текущему файлу данных."""
+        try:
+            with self.index_filepath.open("rb") as file:
+                header = json.loads(file.readline())
+                expected = {"version": self.index_version}
+                expected.update(self._fingerprint())
+                if any(header.get(k) != v for k, v in expected.items()):
+                    return None
+                columns = []
+                for _ in range(3):
+                    column = array("q")
+                    column.fromfile(file, header["count"])
+                    columns.append(column)
+        except (OSError, ValueError, EOFError, KeyError):
+            return None
+        return RecordIndex(*columns, next_id=header["next_id"])
+
+    def _save_index(self, index: RecordIndex) -> None:
+        header = {"version": self.index_version, "count": len(index)}
+        header.update(self._fingerprint())
+        header["next_id"] = index.next_id
+        with self.index_filepath.open("wb") as file:
+            file.write(json.dumps(header).encode("utf-8") + b"\n")
+            for column in (index.ids, index.starts, index.ends):
+                column.tofile(file)
+
+    def _scan_offsets(self) -> list[tuple[int, int, int]]:
+        """Находит границы записей в файле данных без создания книг."""
+        # Файл читается байтами: текстовый режим заменил бы "\r\n" на
+        # "\n", и смещения разошлись бы с байтами файла
+        text = self.filepath.read_bytes().decode("utf-8")
+        decoder = json.JSONDecoder()
+        offsets = []
+        position = self._skip_whitespace(text, 0)
+        if position == len(text):
+            return offsets
+        if text[position] != "[":
+            raise json.JSONDecodeError(
+                f"Ошибка чтения JSON файла {self.filepath}", text, position
+            )
+        position = self._skip_whitespace(text, position + 1)
+        # Смещения в индексе байтовые, поэтому позиции в строке
+        # переводятся в байты по мере продвижения по файлу.
+        byte_position, char_position = 0, 0
+        while position < len(text) and text[position] != "]":
+            try:
+                item, end = decoder.raw_decode(text, position)
+            except json.JSONDecodeError as e:
+                raise json.JSONDecodeError(
+                    f"Ошибка чтения JSON файла {self.filepath}", e.doc, e.pos
+                ) from e
+            gap = text[char_position:position]
+            start = byte_position + len(gap.encode("utf-8"))
+            byte_position = start + len(text[position:end].encode("utf-8"))
+            char_position = end
+            offsets.append((item["id"], start, byte_position))
+            position = self._skip_whitespace(text, end)
+            if position < len(text) and text[position] == ",":
+                position = self._skip_whitespace(text, position + 1)
+        return offsets
+
+    @staticmethod
+    def _skip_whitespace(text: str, position: int) -> int:
+        while position < len(text) and text[position].isspace():
+            position += 1
+        return position
@@ -0,0 +1,181 @@
+import heapq
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Any, Callable, Iterable
+
+from books import Book, Loan
+
+
+class SortedIndex:
+    """Поддерживаемый порядок книг по ключу сортировки."""
+
+    def __init__(self, key: Callable[[Book], Any], books: Iterable[Book]):
+        self.key = key
+        # Пары (ключ, id): id делает порядок однозначным при равных ключах
+        self._entries: list[tuple[Any, int]] = sorted(
+            (key(book), book.id) for book in books
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, book: Book) -> None:
+        """Добавляет книгу в индекс."""
+        insort(self._entries, (self.key(book), book.id))
+
+    def remove(self, book: Book) -> None:
+        """Удаляет книгу из индекса."""
+        entry = (self.key(book), book.id)
+        position = bisect_left(self._entries, entry)
+        if (
+            position < len(self._entries)
+            and self._entries[position] == entry
+        ):
+            del self._entries[position]
+
+    def ids(
+        self, offset: int = 0, limit: int | None = None, reverse: bool = False
+    ) -> list[int]:
+        """Возвращает id книг страницы в заданном порядке."""
+        total = len(self._entries)
+        stop = total if limit is None else min(total, offset + limit)
+        if offset >= stop:
+            return []
+        if reverse:
+            page = self._entries[total - stop : total - offset]
+            page.reverse()
+        else:
+            page = self._entries[offset:stop]
+        return [id for _, id in page]
+
+
+class PrefixIndex:
+    """
+    Префиксный индекс значений поля для автодополнения. Ключами служат
+    нормализованное значение и его окончания, начинающиеся с каждого
+    слова, поэтому `наказ` находит «Преступление и наказание». Ключи
+    хранятся в отсортированном списке: подходящие под префикс ключи идут
+    подряд и находятся двоичным поиском.
+    """
+
+    def __init__(self, field_name: str, books: Iterable[Book]):
+        self.field_name = field_name
+        # Ключ -> исходные значения поля и количество книг с ними
+        self._values: dict[str, dict[str, int]] = {}
+        for book in books:
+            self._count(book, 1)
+        self._keys: list[str] = sorted(self._values)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, book: Book) -> None:
+        """Добавляет значение поля книги в индекс."""
+        for key in self._count(book, 1):
+            insort(self._keys, key)
+
+    def remove(self, book: Book) -> None:
+        """Удаляет значение поля книги из индекса."""
+        for key in self._count(book, -1):
+            position = bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+
+    def suggest(self, prefix: str, limit: int) -> list[str]:
+        """
+        Возвращает до `limit` различных значений поля, у которых значение
+        или одно из слов начинается с нормализованного префикса, в порядке
+        ключей. Просматриваются только ключи с этим префиксом.
+        """
+        found: dict[str, None] = {}
+        position = bisect_left(self._keys, prefix)
+        while len(found) < limit and position < len(self._keys):
+            key = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            for value in self._values[key]:
+                found[value] = None
+            position += 1
+        return list(found)[:limit]
+
+    def _count(self, book: Book, delta: int) -> list[str]:
+        """
+        Изменяет на `delta` счетчики значения книги по всем её ключам.
+        Возвращает ключи, которые появились или исчезли.
+        """
+        value = getattr(book, self.field_name)
+        key = getattr(book, f"{self.field_name}_key")
+        changed = []
+        for start, char in enumerate(key):
+            if char == " " or (start and key[start - 1] != " "):
+                continue
+            suffix = key[start:]
+            values = self._values.get(suffix)
+            if values is None:
+                if delta < 0:
+                    continue
+                values = self._values[suffix] = {}
+                changed.append(suffix)
+            count = values.get(value, 0) + delta
+            if count > 0:
+                values[value] = count
+            elif values.pop(value, None) is not None and not values:
+                del self._values[suffix]
+                changed.append(suffix)
+        return changed
+
+
+class DueDateIndex:
+    """
+    Очередь с приоритетом по сроку возврата. Записи о возвращенных книгах
+    удаляются из кучи лениво и пропускаются при запросах.
+    """
+
+    def __init__(self, loans: Iterable[Loan] = ()):
+        self._due: dict[int, date] = {
+            loan.book_id: loan.due_date for loan in loans
+        }
+        self._heap: list[tuple[date, int]] = [
+            (due_date, book_id) for book_id, due_date in self._due.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def add(self, loan: Loan) -> None:
+        """Добавляет выдачу или обновляет её срок."""
+        self._due[loan.book_id] = loan.due_date
+        heapq.heappush(self._heap, (loan.due_date, loan.book_id))
+        self._compact()
+
+    def remove(self, book_id: int) -> None:
+        """Удаляет выдачу книги."""
+        self._due.pop(book_id, None)
+        self._compact()
+
+    def _compact(self) -> None:
+        """Перестраивает кучу, когда устаревших записей больше половины."""
+        if len(self._heap) > 2 * len(self._due) + 16:
+            self._heap = [(due, id) for id, due in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def due_until(self, limit: date) -> list[int]:
+        """
+        Возвращает id книг со сроком возврата не позже `limit` в порядке
+        срока. Обходятся только вершины кучи со сроком не позже `limit`,
+        поэтому время зависит от размера ответа, а не от числа выдач.
+        """
+        heap, found, stack = self._heap, [], [0]
+        while stack:
+            position = stack.pop()
+            if position >= len(heap) or heap[position][0] > limit:
+                continue
+            due_date, book_id = heap[position]
+            if self._due.get(book_id) == due_date:
+                found.append((due_date, book_id))
+            stack.append(2 * position + 1)
+            stack.append(2 * position + 2)
+        found.sort()
+        # Повторная выдача с тем же сроком оставляет дубликат в куче
+        return list(dict.fromkeys(book_id for _, book_id in found))
@@ -1,46 +1,302 @@
-from books import Book, Status
-from filemanagers import FileManager
+import gc
+import heapq
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import date, timedelta
+from typing import Any, Callable, Iterable, Iterator
+
+from books import Book, Loan, Status, normalize_text
+from filemanagers import FileManager, RecordIndex
+from indexes import DueDateIndex, PrefixIndex, SortedIndex
+from parallel import ParallelSearch
+from stores import BookStore, DictBookStore
 
 
 class LibraryManager:
     """Менеджер книг."""
 
     search_fields: tuple[str] = ("title", "author", "year")
+    sort_fields: tuple[str] = ("id", "title", "author", "year")
+    suggest_fields: tuple[str] = ("title", "author")
+    loan_days: int = 14
+    # После сохранения каталога журнал изменений длиннее этого
+    # количества записей начинается заново
+    changelog_limit: int = 10_000
+    # Поиск выполняется параллельно в рабочих процессах, если в каталоге
+    # не меньше `parallel_threshold` книг и процессов больше одного
+    parallel_threshold: int = 200_000
+    search_workers: int = os.cpu_count() or 1
 
-    def __init__(self, book_class: type[Book], file_manager: FileManager):
+    def __init__(
+        self,
+        book_class: type[Book],
+        file_manager: FileManager,
+        lazy: bool = False,
+        store_class: type[BookStore] = DictBookStore,
+        publish_changes: bool = False,
+    ):
         self.file_manager = file_manager
         self.book_class: type[Book] = book_class
-        self._books: dict[int, Book] = {}
+        self.store_class: type[BookStore] = store_class
+        self._books: BookStore = store_class()
         self._next_id: int = 1
-        self._initialize_books()
+        # Индекс смещений записей, пока каталог загружен не полностью
+        self._index: RecordIndex | None = None
+        # Порядки сортировки строятся при первом запросе и далее
+        # обновляются при добавлении и удалении книг
+        self._sorted: dict[str, SortedIndex] = {}
+        # Префиксные индексы для автодополнения строятся так же
+        self._prefixes: dict[str, PrefixIndex] = {}
+        # Рабочие процессы поиска запускаются при первом поиске
+        self._parallel: ParallelSearch | None = None
+        # Глубина вложенности deferred_save и признак несохраненных изменений
+        self._save_depth: int = 0
+        self._unsaved: bool = False
+        # Журнал изменений для реплик: номер последней записи и
+        # количество записей в текущем журнале
+        self.publish_changes: bool = publish_changes
+        self._seq: int = 0
+        self._saved_seq: int = 0
+        self._changes_count: int = 0
+        # Выдачи книг хранятся отдельно от каталога и загружаются первыми:
+        # применение журнала при загрузке меняет и выдачи
+        self._loans: dict[int, Loan] = {}
+        self._due = DueDateIndex()
+        self._loans_changed: bool = False
+        self._load_loans()
+        self._initialize_books(lazy)
+        if publish_changes:
+            self._open_changes()
+
+    def _load_loans(self) -> None:
+        """Загружает записи о выдаче книг из файла."""
+        self._loans = {
+            item["book_id"]: Loan.from_dict(item)
+            for item in self.file_manager.load_loans()
+        }
+        self._due = DueDateIndex(self._loans.values())
+        self._loans_changed = False
+
+    def _initialize_books(self, lazy: bool = False) -> None:
+        """Загружает книги из файла и определяет следующий доступный ID.
 
-    def _initialize_books(self) -> None:
-        """Загружает книги из файла и определяет следующий доступный ID."""
-        data = self.file_manager.load()
-        if data:
-            self._books = {
-                item["id"]: self.book_class.from_dict(item) for item in data
-            }
-            self._next_id = max(int(id) for id in self._books) + 1
+        В ленивом режиме читается только индекс смещений, а книги
+        создаются по мере обращения к ним.
+        """
+        if lazy:
+            index = self.file_manager.load_index()
+            if index is not None:
+                self._index = index
+                self._next_id = index.next_id
+                return
+        books = self._read_books()
+        if self._index is not None:
+            # Уже созданные в ленивом режиме книги переиспользуются
+            loaded = self._books
+            books = [loaded.get(book.id) or book for book in books]
+        self._books = self.store_class((book.id, book) for book in books)
+        self._next_id = max((book.id for book in books), default=0) + 1
+        self._index = None
+        self._sorted = {}
+        self._prefixes = {}
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
+
+    def _read_books(self) -> list[Book]:
+        """
+        Читает книги из снимка каталога, а если снимок устарел, разбирает
+        файл с валидацией каждой записи и обновляет снимок.
+        """
+        tag = f"{self.book_class.__module__}.{self.book_class.__qualname__}"
+        # При массовом создании объектов сборщик мусора только тратит время
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            records = self.file_manager.load_snapshot(tag)
+            if records is not None:
+                return [self.book_class.from_record(item) for item in records]
+            # Ключ снимка вычисляется по тем же байтам, что разбираются:
+            # иначе при замене файла другим процессом снимок устареет
+            data, key = self.file_manager.load_with_snapshot_key(tag)
+            books = [self.book_class.from_dict(item) for item in data]
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self.file_manager.save_snapshot(
+            key, [book.to_record() for book in books]
+        )
+        return books
+
+    def _ensure_loaded(self) -> None:
+        """Догружает весь каталог, если он был открыт в ленивом режиме."""
+        if self._index is not None:
+            self._initialize_books()
+
+    def _load_book(self, id: int) -> Book | None:
+        """Создает книгу из записи файла по индексу смещений."""
+        position = self._index.get(id)
+        if position is None:
+            return None
+        try:
+            record = self.file_manager.load_record(*position)
+        except ValueError:
+            record = None
+        # Если запись не читается отдельно или индекс разошелся с файлом,
+        # каталог загружается целиком
+        if not isinstance(record, dict) or record.get("id") != id:
+            self._ensure_loaded()
+            return self._books.get(id)
+        book = self.book_class.from_dict(record)
+        self._books[id] = book
+        return book
 
     def _save_books(self) -> None:
         """Сохраняет текущие данные о книгах в файл."""
+        if self._save_depth:
+            self._unsaved = True
+            return
+        self._ensure_loaded()
         data = [book.to_dict() for book in self._books.values()]
         self.file_manager.save(data)
+        if self._loans_changed:
+            loans = [loan.to_dict() for loan in self._loans.values()]
+            self.file_manager.save_loans(loans)
+            self._loans_changed = False
+        self._unsaved = False
+        # Все записи журнала теперь есть в файле каталога
+        if self.publish_changes and self._saved_seq < self._seq:
+            if self._changes_count >= self.changelog_limit:
+                self.file_manager.reset_changes(self._seq)
+                self._changes_count = 0
+            else:
+                self._record_changes([{"op": "saved"}])
+            self._saved_seq = self._seq
+
+    @contextmanager
+    def deferred_save(self) -> Iterator[None]:
+        """
+        Откладывает сохранение каталога до выхода из блока: все изменения
+        внутри блока записываются в файл одним сохранением.
+        """
+        self._save_depth += 1
+        try:
+            yield
+        finally:
+            self._save_depth -= 1
+            if not self._save_depth and self._unsaved:
+                self._save_books()
+
+    def _open_changes(self) -> None:
+        """
+        Продолжает журнал изменений. Записи после последней отметки
+        `saved`, которые не успели попасть в файл каталога, применяются
+        к каталогу и сохраняются.
+        """
+        header, records, _ = self.file_manager.read_changes()
+        if header is None:
+            self.file_manager.reset_changes(0)
+            return
+        self._seq = self._saved_seq = header["seq"]
+        self._changes_count = len(records)
+        unsaved = []
+        for record in records:
+            self._seq = record["seq"]
+            if record["op"] == "saved":
+                self._saved_seq = self._seq
+                unsaved = []
+            else:
+                unsaved.append(record)
+        if unsaved:
+            self._ensure_loaded()
+            for record in unsaved:
+                self._apply_change(record)
+            self._save_books()
+
+    def _record_changes(self, changes: list[dict[str, Any]]) -> None:
+        """Дописывает изменения каталога в журнал с номерами по порядку."""
+        if not self.publish_changes or not changes:
+            return
+        now = time.time()
+        records = []
+        for change in changes:
+            self._seq += 1
+            records.append({"seq": self._seq, "time": now, **change})
+        self.file_manager.append_changes(records)
+        self._changes_count += len(records)
+
+    def _apply_change(self, record: dict[str, Any]) -> None:
+        """Применяет запись журнала; повторное применение безопасно."""
+        if record["op"] == "put":
+            book = self.book_class.from_dict(record["book"])
+            self._put_book(book)
+            if book.status == Status.AVAILABLE.value:
+                self._remove_loan(book.id)
+            elif record.get("loan"):
+                self._add_loan(Loan.from_dict(record["loan"]))
+        elif record["op"] == "delete":
+            if record["id"] in self._books:
+                self._drop_book(record["id"])
+            self._remove_loan(record["id"])
+        self._seq = record["seq"]
+
+    def _put_book(self, book: Book) -> None:
+        """Добавляет или заменяет книгу в каталоге и его индексах."""
+        old_book = self._books.get(book.id)
+        self._books[book.id] = book
+        for index in self._sorted.values():
+            # Изменение статуса не меняет ключ сортировки
+            if old_book and index.key(old_book) == index.key(book):
+                continue
+            if old_book:
+                index.remove(old_book)
+            index.add(book)
+        for field_name, index in self._prefixes.items():
+            value = getattr(book, field_name)
+            if old_book and getattr(old_book, field_name) == value:
+                continue
+            if old_book:
+                index.remove(old_book)
+            index.add(book)
+        if self._parallel is not None:
+            self._parallel.put(book)
+        self._next_id = max(self._next_id, book.id + 1)
+
+    def _drop_book(self, id: int) -> Book:
+        """Удаляет книгу из каталога и его индексов."""
+        book = self._books.pop(id)
+        for index in self._sorted.values():
+            index.remove(book)
+        for index in self._prefixes.values():
+            index.remove(book)
+        if self._parallel is not None:
+            self._parallel.delete(id)
+        return book
 
     def get_book(self, id: int) -> Book:
         """Возвращает книгу по её ID."""
         book = self._books.get(id)
+        if not book and self._index is not None:
+            book = self._load_book(id)
         if not book:
             raise ValueError(f"Книга с id `{id}` не найдена.")
         return book
 
     def get_books(self) -> list[Book]:
         """Возвращает список всех книг."""
+        self._ensure_loaded()
         return [book for book in self._books.values()]
 
+    def iter_books(self) -> Iterator[Book]:
+        """Перебирает все книги без создания списка."""
+        self._ensure_loaded()
+        return iter(self._books.values())
+
     def add_book(self, title: str, author: str, year: int) -> Book:
         """Добавляет новую книгу в библиотеку."""
+        self._ensure_loaded()
         try:
             new_book = self.book_class(
                 id=self._next_id,
@@ -54,52 +310,219 @@ class LibraryManager:
                 )
         except ValueError as error:
             raise ValueError(str(error)) from error
-        for book in self._books.values():
+        for book in self._search("title", new_book.title_key):
             if book == new_book:
                 raise ValueError(f"Книга `{new_book.title}` уже существует.")
-        self._books[new_book.id] = new_book
+        self._put_book(new_book)
+        self._record_changes([{"op": "put", "book": new_book.to_dict()}])
         self._save_books()
-        self._next_id += 1
         return new_book
 
     def delete_book(self, id: int) -> Book:
         """Удаляет книгу по ID."""
-        deleted_book = self._books.pop(id, None)
-        if not deleted_book:
+        self._ensure_loaded()
+        if id not in self._books:
             raise ValueError(f"Книга с id `{id}` не найдена.")
+        deleted_book = self._drop_book(id)
+        self._record_changes([{"op": "delete", "id": id}])
+        self._remove_loan(id)
         self._save_books()
         return deleted_book
 
-    def update_book_status(self, id: int, new_status: str) -> Book:
-        """Обновляет статус книги."""
-        updated_book = self._books.get(id)
-        if not updated_book:
-            raise ValueError(f"Книга с id `{id}` не найдена.")
-        if new_status not in Status:
-            raise ValueError(f"Статус `{new_status}` не поддерживается.")
-        updated_book.status = new_status
-        self._save_books()
-        return updated_book
+    def update_book_status(
+        self,
+        id: int,
+        new_status: str,
+        borrower: str | None = None,
+        due_date: date | None = None,
+    ) -> Book:
+        """
+        Обновляет статус книги. При выдаче с указанием читателя к книге
+        прикрепляется запись о выдаче, при возврате она удаляется.
+        """
+        updated_books, errors = self.update_books_status(
+            [(id, new_status)], borrower, due_date
+        )
+        if errors:
+            raise ValueError(errors[id])
+        return updated_books[0]
+
+    def update_books_status(
+        self,
+        changes: Iterable[tuple[int, str]],
+        borrower: str | None = None,
+        due_date: date | None = None,
+    ) -> tuple[list[Book], dict[int, str]]:
+        """
+        Обновляет статусы нескольких книг по парам (id, статус) и сохраняет
+        каталог один раз. Возвращает обновленные книги и ошибки по id.
+        Книги, выданные с указанием читателя, получают запись о выдаче со
+        сроком `due_date` (по умолчанию через `loan_days` дней).
+        """
+        loan = None
+        if borrower is not None:
+            today = date.today()
+            due_date = due_date or today + timedelta(days=self.loan_days)
+            loan = Loan(0, borrower, today, due_date)
+        self._ensure_loaded()
+        statuses = {status.value for status in Status}
+        updated_books, errors, published = [], {}, []
+        for id, new_status in changes:
+            updated_book = self._books.get(id)
+            if not updated_book:
+                errors[id] = f"Книга с id `{id}` не найдена."
+            elif new_status not in statuses:
+                errors[id] = f"Статус `{new_status}` не поддерживается."
+            else:
+                updated_book.status = new_status
+                self._put_book(updated_book)
+                updated_books.append(updated_book)
+                change = {"op": "put", "book": updated_book.to_dict()}
+                if new_status == Status.AVAILABLE.value:
+                    self._remove_loan(id)
+                elif loan is not None:
+                    self._add_loan(replace(loan, book_id=id))
+                    # Выдача публикуется вместе с книгой для реплик
+                    change["loan"] = self._loans[id].to_dict()
+                published.append(change)
+        self._record_changes(published)
+        if updated_books:
+            self._save_books()
+        return updated_books, errors
+
+    def get_loan(self, id: int) -> Loan | None:
+        """Возвращает запись о выдаче книги, если она выдана читателю."""
+        return self._loans.get(id)
+
+    def overdue_loans(self, today: date | None = None) -> list[Loan]:
+        """Выдачи с истекшим сроком возврата в порядке срока."""
+        today = today or date.today()
+        ids = self._due.due_until(today - timedelta(days=1))
+        return [self._loans[id] for id in ids]
+
+    def due_loans(self, days: int, today: date | None = None) -> list[Loan]:
+        """Выдачи со сроком возврата в ближайшие `days` дней."""
+        if days < 0:
+            raise ValueError("Количество дней не может быть меньше 0.")
+        today = today or date.today()
+        ids = self._due.due_until(today + timedelta(days=days))
+        loans = (self._loans[id] for id in ids)
+        return [loan for loan in loans if loan.due_date >= today]
+
+    def _add_loan(self, loan: Loan) -> None:
+        self._loans[loan.book_id] = loan
+        self._due.add(loan)
+        self._loans_changed = True
+
+    def _remove_loan(self, id: int) -> None:
+        if self._loans.pop(id, None):
+            self._due.remove(id)
+            self._loans_changed = True
+
+    def get_sorted_books(
+        self,
+        field_name: str,
+        reverse: bool = False,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[Book]:
+        """Возвращает страницу книг, упорядоченных по полю."""
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("Смещение и размер страницы не могут быть < 0.")
+        index = self._sorted.get(field_name)
+        if index is None:
+            key = self._sort_key(field_name)
+            self._ensure_loaded()
+            index = SortedIndex(key, self._books.values())
+            self._sorted[field_name] = index
+        ids = index.ids(offset, limit, reverse)
+        return [self._books[id] for id in ids]
+
+    def top_books(
+        self, field_name: str, k: int, reverse: bool = False
+    ) -> list[Book]:
+        """
+        Возвращает первые k книг в порядке поля. Если порядок по полю уже
+        поддерживается, берется его начало, иначе k книг отбираются кучей
+        без сортировки всего каталога.
+        """
+        if k < 0:
+            raise ValueError("Количество книг не может быть меньше 0.")
+        if field_name in self._sorted:
+            return self.get_sorted_books(field_name, reverse, limit=k)
+        key = self._sort_key(field_name)
+        self._ensure_loaded()
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(
+            k, self._books.values(), key=lambda book: (key(book), book.id)
+        )
+
+    def _sort_key(self, field_name: str) -> Callable[[Book], Any]:
+        """Ключ сортировки книг по полю."""
+        if field_name not in self.sort_fields:
+            raise ValueError(
+                f"Сортировка книг по полю {field_name} не доступна."
+            )
+        return lambda book: book.search_value(field_name)
+
+    def suggest(
+        self, field_name: str, prefix: str, limit: int = 10
+    ) -> list[str]:
+        """
+        Варианты автодополнения: до `limit` различных значений поля title
+        или author, которые начинаются с префикса или содержат слово,
+        начинающееся с него. Индекс строится при первом запросе и далее
+        обновляется при изменении каталога.
+        """
+        if field_name not in self.suggest_fields:
+            raise ValueError(
+                f"Автодополнение по полю {field_name} не доступно."
+            )
+        if limit < 0:
+            raise ValueError("Количество вариантов не может быть меньше 0.")
+        index = self._prefixes.get(field_name)
+        if index is None:
+            self._ensure_loaded()
+            index = PrefixIndex(field_name, self._books.values())
+            self._prefixes[field_name] = index
+        return index.suggest(normalize_text(prefix.lstrip()), limit)
 
     def search_book(self, field_name: str, query: str | int) -> list[Book]:
         """Поиск книг по полям title, author, year."""
+        return list(self.iter_search_book(field_name, query))
+
+    def iter_search_book(
+        self, field_name: str, query: str | int
+    ) -> Iterator[Book]:
+        """Поиск книг по полям title, author, year без сбора в список."""
         field_name = field_name.strip().lower()
         if field_name not in self.search_fields:
             raise ValueError(f"Поиск книг по полю {field_name} не доступен.")
+        self._ensure_loaded()
         if isinstance(query, str):
-            query = query.strip().lower()
-        output = []
-        for book in self._books.values():
-            field_value = getattr(book, field_name)
-            if self._matches_field(field_value, query):
-                output.append(book)
-        return output
-
-    @staticmethod
-    def _matches_field(field_value: str | int, query: str | int) -> bool:
-        """Проверка соответствия значения полю запроса."""
-        if isinstance(field_value, str) and isinstance(query, str):
-            return query in field_value.lower()
-        elif isinstance(field_value, int) and isinstance(query, int):
-            return query == field_value
-        return False
+            query = normalize_text(query.strip())
+        return self._search(field_name, query)
+
+    def get_books_by_status(self, status: str) -> list[Book]:
+        """Возвращает книги с указанным статусом."""
+        if status not in {item.value for item in Status}:
+            raise ValueError(f"Статус `{status}` не поддерживается.")
+        self._ensure_loaded()
+        return list(self._search("status", status))
+
+    def _search(self, field_name: str, query: str | int) -> Iterator[Book]:
+        """
+        Поиск в хранилище. В большом каталоге запрос выполняют рабочие
+        процессы, каждый по своей части, а книги берутся по найденным id.
+        """
+        if self._parallel is None and (
+            self.search_workers > 1
+            and len(self._books) >= self.parallel_threshold
+        ):
+            self._parallel = ParallelSearch(
+                self._books.values(), self.search_workers, self.store_class
+            )
+        if self._parallel is None:
+            return self._books.search(field_name, query)
+        ids = self._parallel.search(field_name, query)
+        return (self._books[id] for id in ids)
@@ -1,10 +1,20 @@
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
 from json import JSONDecodeError
-from typing import Callable
+from typing import Callable, Iterator
 
-from books import Book, Status
+from books import Book, Loan, Status
+from commands import parse_ids, run
+from exporters import export_books, exporters
 from filemanagers import JsonFileManager
 from libraries import LibraryManager
 
+try:
+    import readline
+except ImportError:  # pragma: no cover - нет в Windows
+    readline = None
+
 menu_items: dict[str, str] = {
     "1": "Показать все книги",
     "2": "Получить книгу по ID",
@@ -12,9 +22,15 @@ menu_items: dict[str, str] = {
     "4": "Удалить книгу",
     "5": "Изменить статус книги",
     "6": "Найти книгу",
-    "7": "Выход",
+    "7": "Показать книги по порядку",
+    "8": "Изменить статус нескольких книг",
+    "9": "Экспорт книг",
+    "10": "Просроченные книги и сроки возврата",
+    "11": "Выход",
 }
 
+page_size: int = 10
+
 
 def display_menu() -> None:
     """Отображение меню."""
@@ -37,6 +53,67 @@ def get_input(prompt: str) -> str:
     return input(prompt).strip()
 
 
+@contextmanager
+def completion(complete: Callable[[str], list[str]]) -> Iterator[None]:
+    """
+    Автодополнение ввода по Tab вариантами `complete(введенный текст)`,
+    если доступен модуль readline. Дополняется вся строка целиком.
+    """
+    if readline is None:
+        yield
+        return
+    options: list[str] = []
+
+    def completer(text: str, state: int) -> str | None:
+        if state == 0:
+            options[:] = complete(text)
+        return options[state] if state < len(options) else None
+
+    previous = readline.get_completer(), readline.get_completer_delims()
+    readline.set_completer(completer)
+    readline.set_completer_delims("")
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    try:
+        yield
+    finally:
+        readline.set_completer(previous[0])
+        readline.set_completer_delims(previous[1])
+
+
+def get_ids_input(prompt: str) -> list[int]:
+    """Получение списка ID через запятую, допускаются диапазоны `1-5`."""
+    return parse_ids(get_input(prompt))
+
+
+def get_status_input() -> str:
+    """Выбор статуса книги из списка."""
+    print("\n".join(f"{i}. {s.value}" for i, s in enumerate(Status, 1)))
+    option = get_int_input("Выберите число нужного варианта: ") - 1
+    try:
+        return list(Status)[option].value
+    except IndexError as error:
+        raise ValueError("Выбран неверный вариант.") from error
+
+
+def get_loan_input(library: LibraryManager) -> dict[str, str | date]:
+    """Ввод читателя и срока выдачи; без читателя выдача не записывается."""
+    borrower = get_input("Введите имя читателя (Enter - пропустить): ")
+    if not borrower:
+        return {}
+    days = get_input(f"Срок выдачи в днях (Enter - {library.loan_days}): ")
+    try:
+        days = int(days) if days else library.loan_days
+    except ValueError as error:
+        raise ValueError("Ввод должен быть числом.") from error
+    return {
+        "borrower": borrower,
+        "due_date": date.today() + timedelta(days=days),
+    }
+
+
 def display_books(library: LibraryManager) -> None:
     """Отображение всех книг."""
     books: list[Book] = library.get_books()
@@ -59,7 +136,8 @@ def display_book_by_id(library: LibraryManager) -> None:
 def add_book(library: LibraryManager) -> None:
     """Добавление новой книги в библиотеку."""
     title = get_input("Введите заголовок книги: ")
-    author = get_input("Введите автора книги: ")
+    with completion(lambda text: library.suggest("author", text)):
+        author = get_input("Введите автора книги (Tab - подсказка): ")
     try:
         year = get_int_input("Введите год публикации книги: ")
         new_book: Book = library.add_book(title, author, year)
@@ -82,37 +160,144 @@ def update_status_of_book(library: LibraryManager) -> None:
     """Обновление статуса книги."""
     try:
         book_id = get_int_input("Введите id книги, которую хотите изменить: ")
-        print("\n".join(f"{i}. {s.value}" for i, s in enumerate(Status, 1)))
-        option = get_int_input("Выберите число нужного варианта: ") - 1
-        try:
-            new_status = list(Status)[option].value
-        except IndexError as error:
-            raise ValueError("Выбран неверный вариант.") from error
-        updated_book: Book = library.update_book_status(book_id, new_status)
+        new_status = get_status_input()
+        loan = {}
+        if new_status == Status.BORROWED.value:
+            loan = get_loan_input(library)
+        updated_book: Book = library.update_book_status(
+            book_id, new_status, **loan
+        )
         print(f"\nСтатус книги изменен:\n{updated_book}\n")
     except ValueError as error:
         print(f"\nОшибка: {error}\n")
 
 
-def search_book(library: LibraryManager) -> None:
-    """Поиск книг по названию, автору и году."""
+def update_status_of_books(library: LibraryManager) -> None:
+    """Обновление статуса нескольких книг."""
+    try:
+        book_ids = get_ids_input(
+            "Введите id книг через запятую (например, 1, 3, 5-8): "
+        )
+        new_status = get_status_input()
+        updated_books, errors = library.update_books_status(
+            [(book_id, new_status) for book_id in book_ids]
+        )
+        print(f"\nСтатус изменен у {len(updated_books)} книг.\n")
+        for error in errors.values():
+            print(f"Ошибка: {error}")
+    except ValueError as error:
+        print(f"\nОшибка: {error}\n")
+
+
+def get_search_input(library: LibraryManager) -> tuple[str, str | int]:
+    """Выбор поля поиска и ввод значения для поиска."""
     search_fields = dict(enumerate(library.search_fields, 1))
     print("\n".join(f"{num}. {field}" for num, field in search_fields.items()))
+    option = get_int_input(
+        "Введите номер поля по которому нужно найти книгу: "
+    )
+    field = search_fields.get(option)
+    if not field:
+        raise ValueError("Неверный выбор.")
+    prompt = f"Введите значение для поиска в поле {field}: "
+    if field == "year":
+        return field, get_int_input(prompt)
+    with completion(lambda text: library.suggest(field, text)):
+        return field, get_input(prompt.replace(":", " (Tab - подсказка):"))
+
+
+def search_book(library: LibraryManager) -> None:
+    """Поиск книг по названию, автору и году."""
     try:
-        option = get_int_input(
-            "Введите номер поля по которому нужно найти книгу: "
-        )
-        field = search_fields.get(option)
-        if field:
-            prompt = f"Введите значение для поиска в поле {field}: "
-            query = (
-                get_int_input(prompt) if field == "year" else get_input(prompt)
+        field, query = get_search_input(library)
+        books: list[Book] = library.search_book(field, query)
+        print(f"\nПо вашему запросу найдено {len(books)} совпадений:\n")
+        print("\n\n".join(str(book) for book in books))
+    except ValueError as error:
+        print(f"\nОшибка: {error}\n")
+
+
+def display_sorted_books(library: LibraryManager) -> None:
+    """Постраничное отображение книг в выбранном порядке."""
+    sort_fields = dict(enumerate(library.sort_fields, 1))
+    print("\n".join(f"{num}. {field}" for num, field in sort_fields.items()))
+    try:
+        option = get_int_input("Введите номер поля для сортировки: ")
+        field = sort_fields.get(option)
+        if not field:
+            print("\nОшибка: Неверный выбор.\n")
+            return
+        reverse = get_input("Сортировать по убыванию? (y/n): ") == "y"
+        offset = 0
+        while True:
+            books: list[Book] = library.get_sorted_books(
+                field, reverse, offset, page_size
             )
-            books: list[Book] = library.search_book(field, query)
-            print(f"\nПо вашему запросу найдено {len(books)} совпадений:\n")
+            if not books:
+                if not offset:
+                    print("\nВ библиотеке пока нет книг.\n")
+                break
+            print(f"\nСтраница {offset // page_size + 1}:\n")
             print("\n\n".join(str(book) for book in books))
+            offset += len(books)
+            if len(books) < page_size:
+                break
+            prompt = "\nEnter - следующая страница, q - выход: "
+            if get_input(prompt).lower() == "q":
+                break
+    except ValueError as error:
+        print(f"\nОшибка: {error}\n")
+
+
+def export_catalog(library: LibraryManager) -> None:
+    """Экспорт каталога или результатов поиска в файл."""
+    formats = dict(enumerate(exporters, 1))
+    print("\n".join(f"{num}. {name}" for num, name in formats.items()))
+    try:
+        option = get_int_input("Введите номер формата экспорта: ")
+        export_format = formats.get(option)
+        if not export_format:
+            raise ValueError("Неверный выбор.")
+        filename = get_input("Введите имя файла: ")
+        if not filename:
+            raise ValueError("Имя файла не может быть пустым.")
+        if get_input("Экспортировать результаты поиска? (y/n): ") == "y":
+            books = library.iter_search_book(*get_search_input(library))
         else:
-            print("\nОшибка: Неверный выбор.\n")
+            books = library.iter_books()
+        count = export_books(books, filename, export_format)
+        print(f"\nЭкспортировано книг: {count} в файл {filename}\n")
+    except (ValueError, OSError) as error:
+        print(f"\nОшибка: {error}\n")
+
+
+def format_loan(library: LibraryManager, loan: Loan) -> str:
+    """Строка с книгой, читателем и сроком возврата."""
+    book = library.get_book(loan.book_id)
+    return (
+        f"id: {book.id}, {book.title} - {loan.borrower}, "
+        f"вернуть до {loan.due_date.isoformat()}"
+    )
+
+
+def display_due_loans(library: LibraryManager) -> None:
+    """Отображение просроченных книг и книг, которые скоро нужно вернуть."""
+    try:
+        days = get_input(
+            "Показать книги со сроком возврата в ближайшие N дней "
+            "(Enter - только просроченные): "
+        )
+        try:
+            days = int(days) if days else None
+        except ValueError as error:
+            raise ValueError("Ввод должен быть числом.") from error
+        loans = library.overdue_loans()
+        print(f"\nПросрочено книг: {len(loans)}\n")
+        print("\n".join(format_loan(library, loan) for loan in loans))
+        if days is not None:
+            loans = library.due_loans(days)
+            print(f"\nНужно вернуть в ближайшие {days} дн.: {len(loans)}\n")
+            print("\n".join(format_loan(library, loan) for loan in loans))
     except ValueError as error:
         print(f"\nОшибка: {error}\n")
 
@@ -124,19 +309,28 @@ actions: dict[str, Callable[[LibraryManager], None]] = {
     "4": delete_book,
     "5": update_status_of_book,
     "6": search_book,
+    "7": display_sorted_books,
+    "8": update_status_of_books,
+    "9": export_catalog,
+    "10": display_due_loans,
 }
 
 
-def main():
-    """Точка входа."""
+def main(argv: list[str] | None = None):
+    """Точка входа. С аргументами запускается неинтерактивный режим."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        sys.exit(run(argv))
     try:
         file_manager = JsonFileManager("library.json")
-        library = LibraryManager(Book, file_manager)
+        library = LibraryManager(
+            Book, file_manager, lazy=True, publish_changes=True
+        )
         while True:
             try:
                 display_menu()
                 choice = input("Введите число выбора: ")
-                if choice == "7":
+                if choice == "11":
                     print("\nДо свидания!!!\n")
                     break
                 action = actions.get(choice)
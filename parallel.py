@@ -0,0 +1,125 @@
+import heapq
+import multiprocessing
+import weakref
+from multiprocessing.connection import Connection
+from typing import Any, Iterable
+
+from books import Book
+from stores import BookStore
+
+
+def _serve_chunk(
+    connection: Connection,
+    chunk: list[list[tuple]],
+    book_class: type[Book],
+    store_class: type[BookStore],
+) -> None:
+    """
+    Цикл рабочего процесса: хранит свою часть каталога и выполняет
+    команды основного процесса до получения None. Записи части
+    каталога передаются в списке, который очищается после создания
+    хранилища, чтобы не держать их в памяти процесса.
+    """
+    records = chunk.pop()
+    store = store_class(
+        (record[0], book_class.from_record(record)) for record in records
+    )
+    del records
+    while True:
+        message = connection.recv()
+        if message is None:
+            return
+        command, *args = message
+        if command == "put":
+            store[args[0][0]] = book_class.from_record(args[0])
+        elif command == "delete":
+            store.pop(args[0], None)
+        elif command == "search":
+            try:
+                ids = sorted(book.id for book in store.search(*args))
+            except Exception as error:
+                ids = error
+            connection.send(ids)
+
+
+class ParallelSearch:
+    """
+    Параллельный поиск: каталог делится на части по `id % workers`,
+    каждую часть хранит свой постоянный рабочий процесс. Запрос
+    рассылается всем процессам, найденные id собираются по возрастанию.
+    Изменения каталога передаются методами `put` и `delete`.
+    """
+
+    def __init__(
+        self,
+        books: Iterable[Book],
+        workers: int,
+        store_class: type[BookStore],
+    ):
+        context = multiprocessing.get_context()
+        chunks: list[list[tuple]] = [[] for _ in range(workers)]
+        book_class = Book
+        for book in books:
+            book_class = type(book)
+            chunks[book.id % workers].append(book.to_record())
+        self._connections: list[Connection] = []
+        processes = []
+        for chunk in chunks:
+            connection, child_connection = context.Pipe()
+            # При запуске через fork часть каталога достается процессу
+            # без сериализации, при spawn передается вместе с аргументами
+            process = context.Process(
+                target=_serve_chunk,
+                args=(child_connection, [chunk], book_class, store_class),
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            self._connections.append(connection)
+            processes.append(process)
+        # Процессы завершаются и при удалении объекта без вызова close
+        self._finalizer = weakref.finalize(
+            self, self._shutdown, self._connections, processes
+        )
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def put(self, book: Book) -> None:
+        """Добавляет или заменяет книгу в части каталога."""
+        connection = self._connections[book.id % len(self._connections)]
+        connection.send(("put", book.to_record()))
+
+    def delete(self, id: int) -> None:
+        """Удаляет книгу из части каталога."""
+        self._connections[id % len(self._connections)].send(("delete", id))
+
+    def search(self, field_name: str, query: Any) -> list[int]:
+        """id найденных книг по возрастанию."""
+        for connection in self._connections:
+            connection.send(("search", field_name, query))
+        results = [connection.recv() for connection in self._connections]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return list(heapq.merge(*results))
+
+    def close(self) -> None:
+        """Останавливает рабочие процессы."""
+        self._finalizer()
+
+    @staticmethod
+    def _shutdown(
+        connections: list[Connection],
+        processes: list[multiprocessing.Process],
+    ) -> None:
+        for connection in connections:
+            try:
+                connection.send(None)
+                connection.close()
+            except OSError:
+                pass
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
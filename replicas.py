@@ -0,0 +1,114 @@
+import time
+from datetime import date
+from typing import Iterable
+
+from books import Book
+from filemanagers import FileManager
+from libraries import LibraryManager
+from stores import BookStore, DictBookStore
+
+
+class ReplicaLibraryManager(LibraryManager):
+    """
+    Реплика каталога только для чтения. Загружает файл каталога и
+    применяет записи журнала изменений, который ведет основной процесс
+    (`LibraryManager(..., publish_changes=True)`). Новые изменения
+    подтягиваются вызовом `sync`.
+    """
+
+    def __init__(
+        self,
+        book_class: type[Book],
+        file_manager: FileManager,
+        store_class: type[BookStore] = DictBookStore,
+    ):
+        # Поколение журнала и смещение в нем, до которого он применен
+        self._generation: int | None = None
+        self._offset: int = 0
+        super().__init__(book_class, file_manager, store_class=store_class)
+
+    def _initialize_books(self, lazy: bool = False) -> None:
+        """
+        Загружает каталог и журнал изменений. Журнал читается до и после
+        загрузки каталога: если за это время основной процесс начал новый
+        журнал, каталог загружается заново, иначе часть изменений
+        потерялась бы между старым журналом и файлом каталога.
+        """
+        while True:
+            header, _, _ = self.file_manager.read_changes()
+            # Прежние книги реплики не переиспользуются: каталог в файле
+            # новее, а книги в нем могли измениться или исчезнуть
+            self._books = self.store_class()
+            self._next_id = 1
+            self._load_loans()
+            super()._initialize_books()
+            current, records, offset = self.file_manager.read_changes()
+            if current == header:
+                break
+        self._generation = header and header["generation"]
+        self._offset = offset
+        self._seq = header["seq"] if header else 0
+        for record in records:
+            self._apply_change(record)
+
+    def sync(self) -> int:
+        """
+        Применяет новые записи журнала изменений. Если журнал начат заново
+        или в номерах записей пропуск, каталог загружается заново.
+        Возвращает, на сколько записей продвинулась реплика.
+        """
+        seq = self._seq
+        header, records, offset = self.file_manager.read_changes(
+            self._offset, self._generation
+        )
+        if header is None:
+            return 0
+        if header["generation"] != self._generation or (
+            records and records[0]["seq"] != self._seq + 1
+        ):
+            self._initialize_books()
+            return self._seq - seq
+        for record in records:
+            self._apply_change(record)
+        self._offset = offset
+        return self._seq - seq
+
+    def replication_lag(self) -> dict[str, int | float]:
+        """
+        Отставание реплики от основного процесса: номер примененной записи,
+        номер последней записи журнала, количество непримененных записей
+        и возраст самой старой из них в секундах.
+        """
+        header, records, _ = self.file_manager.read_changes(
+            self._offset, self._generation
+        )
+        primary_seq = self._seq
+        if records:
+            primary_seq = records[-1]["seq"]
+        elif header is not None:
+            primary_seq = max(header["seq"], self._seq)
+        pending = [record for record in records if record["seq"] > self._seq]
+        seconds = time.time() - pending[0]["time"] if pending else 0.0
+        return {
+            "seq": self._seq,
+            "primary_seq": primary_seq,
+            "records": max(primary_seq - self._seq, 0),
+            "seconds": max(seconds, 0.0),
+        }
+
+    def _save_books(self) -> None:
+        """Реплика не записывает каталог: его ведет основной процесс."""
+
+    def add_book(self, title: str, author: str, year: int) -> Book:
+        raise ValueError("Реплика каталога доступна только для чтения.")
+
+    def delete_book(self, id: int) -> Book:
+        raise ValueError("Реплика каталога доступна только для чтения.")
+
+    def update_books_status(
+        self,
+        changes: Iterable[tuple[int, str]],
+        borrower: str | None = None,
+        due_date: date | None = None,
+    ) -> tuple[list[Book], dict[int, str]]:
+        raise ValueError("Реплика каталога доступна только для чтения.")
@@ -0,0 +1,237 @@
+from abc import abstractmethod
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from typing import Iterable, Iterator
+
+from books import Book, Status, normalize_text
+
+
+def matches_field(field_value: str | int, query: str | int) -> bool:
+    """Проверка соответствия значения полю запроса."""
+    if isinstance(field_value, str) and isinstance(query, str):
+        return query in field_value
+    elif isinstance(field_value, int) and isinstance(query, int):
+        return query == field_value
+    return False
+
+
+class BookStore(MutableMapping):
+    """
+    Хранилище книг по id. Строковые запросы `search` должны быть уже
+    нормализованы функцией `normalize_text`.
+    """
+
+    @abstractmethod
+    def search(self, field_name: str, query: str | int) -> Iterator[Book]:
+        pass
+
+
+class DictBookStore(dict, BookStore):
+    """Хранилище книг в словаре: книги хранятся как объекты Book."""
+
+    def search(self, field_name: str, query: str | int) -> Iterator[Book]:
+        if field_name == "status":
+            return (book for book in self.values() if book.status == query)
+        return (
+            book
+            for book in self.values()
+            if matches_field(book.search_value(field_name), query)
+        )
+
+
+class ColumnarBookStore(BookStore):
+    """
+    Колоночное хранилище книг. Поля хранятся в параллельных массивах
+    (id, год, код статуса, коды названия и автора в общей таблице строк),
+    удаленные записи отмечаются в битовой карте. Объекты Book создаются
+    при обращении и не связаны с хранилищем: измененную книгу нужно
+    записать обратно через `store[id] = book`.
+    """
+
+    statuses: tuple[str, ...] = tuple(status.value for status in Status)
+
+    def __init__(self, items: Iterable[tuple[int, Book]] = ()):
+        self._book_class: type[Book] = Book
+        self._ids = array("q")
+        self._years = array("q")
+        self._status_codes = array("b")
+        self._titles = array("L")
+        self._authors = array("L")
+        self._deleted = bytearray()
+        self._count = 0
+        # Таблица строк: строка, её нормализованный ключ и обратный индекс
+        self._strings: list[str] = []
+        self._string_keys: list[str] = []
+        self._string_codes: dict[str, int] = {}
+        # Позиции по id, если id добавлялись не по возрастанию
+        self._slots: dict[int, int] | None = None
+        for id, book in items:
+            self[id] = book
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, id: object) -> bool:
+        return self._slot(id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        deleted = self._deleted
+        return (id for slot, id in enumerate(self._ids) if not deleted[slot])
+
+    def __getitem__(self, id: int) -> Book:
+        slot = self._slot(id)
+        if slot is None:
+            raise KeyError(id)
+        return self._materialize(slot)
+
+    def __setitem__(self, id: int, book: Book) -> None:
+        self._book_class = type(book)
+        slot = self._slot(id, include_deleted=True)
+        if slot is None:
+            slot = len(self._ids)
+            if self._slots is None and slot and id < self._ids[-1]:
+                self._slots = {
+                    known_id: known_slot
+                    for known_slot, known_id in enumerate(self._ids)
+                }
+            if self._slots is not None:
+                self._slots[id] = slot
+            self._ids.append(id)
+            self._years.append(book.year)
+            self._status_codes.append(self.statuses.index(book.status))
+            self._titles.append(self._intern(book.title))
+            self._authors.append(self._intern(book.author))
+            self._deleted.append(0)
+            self._count += 1
+            return
+        if self._deleted[slot]:
+            self._deleted[slot] = 0
+            self._count += 1
+        self._years[slot] = book.year
+        self._status_codes[slot] = self.statuses.index(book.status)
+        self._titles[slot] = self._intern(book.title)
+        self._authors[slot] = self._intern(book.author)
+
+    def __delitem__(self, id: int) -> None:
+        slot = self._slot(id)
+        if slot is None:
+            raise KeyError(id)
+        self._deleted[slot] = 1
+        self._count -= 1
+        if len(self._ids) > 2 * self._count + 1024:
+            self._compact()
+
+    def values(self) -> Iterator[Book]:
+        """Перебирает книги по порядку позиций без поиска по id."""
+        deleted = self._deleted
+        return (
+            self._materialize(slot)
+            for slot in range(len(self._ids))
+            if not deleted[slot]
+        )
+
+    def items(self) -> Iterator[tuple[int, Book]]:
+        return ((book.id, book) for book in self.values())
+
+    def search(self, field_name: str, query: str | int) -> Iterator[Book]:
+        """
+        Поиск сканированием колонок: год и статус ищутся методом
+        `array.index`, а строки сначала сопоставляются с таблицей
+        уникальных строк, затем сканируется колонка их кодов.
+        """
+        if field_name in ("title", "author"):
+            if not isinstance(query, str):
+                return iter(())
+            codes = {
+                code
+                for code, key in enumerate(self._string_keys)
+                if query in key
+            }
+            column = self._titles if field_name == "title" else self._authors
+            if len(codes) == 1:
+                slots = self._scan(column, codes.pop())
+            else:
+                slots = (
+                    slot
+                    for slot, code in enumerate(column)
+                    if code in codes
+                )
+        elif field_name == "year":
+            if not isinstance(query, int):
+                return iter(())
+            slots = self._scan(self._years, query)
+        elif field_name == "status":
+            if query not in self.statuses:
+                return iter(())
+            code = self.statuses.index(query)
+            slots = self._scan(self._status_codes, code)
+        else:
+            raise ValueError(f"Поиск книг по полю {field_name} не доступен.")
+        deleted = self._deleted
+        return (
+            self._materialize(slot) for slot in slots if not deleted[slot]
+        )
+
+    @staticmethod
+    def _scan(column: array, value: int) -> Iterator[int]:
+        """Позиции значения в колонке; сравнение выполняется в C-коде."""
+        slot = -1
+        while True:
+            try:
+                slot = column.index(value, slot + 1)
+            except ValueError:
+                return
+            yield slot
+
+    def _slot(self, id: object, include_deleted: bool = False) -> int | None:
+        """Позиция книги по id."""
+        if self._slots is not None:
+            slot = self._slots.get(id)
+        else:
+            if not isinstance(id, int):
+                return None
+            slot = bisect_left(self._ids, id)
+            if slot == len(self._ids) or self._ids[slot] != id:
+                slot = None
+        if slot is None or (self._deleted[slot] and not include_deleted):
+            return None
+        return slot
+
+    def _intern(self, value: str) -> int:
+        """Код строки в общей таблице строк."""
+        code = self._string_codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._string_keys.append(normalize_text(value))
+            self._string_codes[value] = code
+        return code
+
+    def _materialize(self, slot: int) -> Book:
+        """Создает объект Book из значений колонок."""
+        title, author = self._titles[slot], self._authors[slot]
+        return self._book_class.from_record(
+            (
+                self._ids[slot],
+                self._strings[title],
+                self._strings[author],
+                self._years[slot],
+                self.statuses[self._status_codes[slot]],
+            ),
+            keys={
+                "title": self._string_keys[title],
+                "author": self._string_keys[author],
+            },
+        )
+
+    def _compact(self) -> None:
+        """Убирает удаленные записи и неиспользуемые строки."""
+        books = list(self.values())
+        self.__init__((book.id, book) for book in books)
+
+
+stores: dict[str, type[BookStore]] = {
+    "dict": DictBookStore,
+    "columnar": ColumnarBookStore,
+}
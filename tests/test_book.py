@@ -1,7 +1,8 @@
 from datetime import date
 from unittest import TestCase
+from unittest.mock import patch
 
-from books import Book
+from books import Book, Loan, normalize_text
 
 
 class TestBook(TestCase):
@@ -59,6 +60,48 @@ class TestBook(TestCase):
         book_from_dict = self.book_class.from_dict(self.data)
         self.assertEqual(book_obj, book_from_dict)
 
+    def test_of_converting_object_to_record(self):
+        """
+        Тест методов `to_record` и `from_record`, преобразующих объект
+        класса Book в кортеж и обратно.
+        """
+        book_obj = self.book_class(**self.data)
+        record = book_obj.to_record()
+        self.assertEqual(record, tuple(self.data.values()))
+        book_from_record = self.book_class.from_record(record)
+        self.assertEqual(book_from_record.to_dict(), self.data)
+
+    def test_normalized_keys(self):
+        """Тест: Нормализованные ключи вычисляются и обновляются."""
+        book_obj = self.book_class(**self.data)
+        self.assertEqual(book_obj.title_key, "преступление и наказание")
+        book_obj.author = "Фёдор ДОСТОЕВСКИЙ"
+        self.assertEqual(book_obj.author_key, "федор достоевский")
+        self.assertEqual(book_obj.search_value("year"), self.data["year"])
+        book_from_record = self.book_class.from_record(book_obj.to_record())
+        self.assertEqual(book_from_record.author_key, book_obj.author_key)
+
+    def test_keys_normalized_once(self):
+        """Тест: При создании книги каждый ключ нормализуется один раз."""
+        with patch("books.normalize_text", wraps=normalize_text) as normalize:
+            self.book_class(**self.data)
+        self.assertEqual(
+            normalize.call_count, len(self.book_class.normalized_fields)
+        )
+
+    def test_normalize_text(self):
+        """Тест: Нормализация учитывает регистр, ё и форму Unicode."""
+        decomposed = "Е\u0308лка"
+        self.assertEqual(normalize_text(decomposed), "елка")
+        self.assertEqual(normalize_text("ЁЛКА"), normalize_text("ёлка"))
+        self.assertEqual(normalize_text("Straße"), "strasse")
+
+    def test_equality_ignores_case_and_yo(self):
+        """Тест: Книги сравниваются по нормализованным ключам."""
+        book_obj = self.book_class(**self.data)
+        other = self.book_class(**{**self.data, "author": "ФЁДОР Достоевский"})
+        self.assertEqual(book_obj, other)
+
     def test_of_string_representation(self):
         """Тест строкового представления объекта класса Book."""
         book_obj = self.book_class(**self.data)
@@ -66,3 +109,18 @@ class TestBook(TestCase):
             f"{key}: {value}" for key, value in self.data.items()
         )
         self.assertEqual(str(book_obj), book_string)
+
+
+class TestLoan(TestCase):
+    def test_loan_to_dict_and_back(self):
+        """Тест: Выдача преобразуется в словарь с датами ISO и обратно."""
+        loan = Loan(1, " Иван ", date(2024, 1, 1), date(2024, 1, 15))
+        data = loan.to_dict()
+        self.assertEqual(data["borrower"], "Иван")
+        self.assertEqual(data["due_date"], "2024-01-15")
+        self.assertEqual(Loan.from_dict(data), loan)
+
+    def test_loan_with_incorrect_dates(self):
+        """Тест: Срок возврата раньше выдачи вызывает ValueError."""
+        with self.assertRaises(ValueError):
+            Loan(1, "Иван", date(2024, 1, 15), date(2024, 1, 1))
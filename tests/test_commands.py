@@ -0,0 +1,142 @@
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from unittest import TestCase
+from unittest.mock import patch
+
+from books import Status
+from commands import parse_ids, run
+from filemanagers import JsonFileManager
+
+
+class TestCommands(TestCase):
+    """Тестирование неинтерактивного режима."""
+
+    def setUp(self):
+        self.sample_data = [
+            {
+                "id": 1,
+                "title": "Преступление и наказание",
+                "author": "Федор Достоевский",
+                "year": 1866,
+                "status": Status.AVAILABLE.value,
+            },
+            {
+                "id": 2,
+                "title": "1984",
+                "author": "Джордж Оруэлл",
+                "year": 1949,
+                "status": Status.AVAILABLE.value,
+            },
+        ]
+        with NamedTemporaryFile(delete=False, suffix=".json") as temp_file:
+            self.file_path = Path(temp_file.name)
+        self.file_manager = JsonFileManager(self.file_path)
+        self.file_manager.save(self.sample_data)
+
+    def tearDown(self):
+        self.file_path.unlink(missing_ok=True)
+        self.file_manager.index_filepath.unlink(missing_ok=True)
+        self.file_manager.snapshot_filepath.unlink(missing_ok=True)
+        self.file_manager.loans_filepath.unlink(missing_ok=True)
+        self.file_manager.changes_filepath.unlink(missing_ok=True)
+
+    def run_commands(self, *argv: str, stdin: str = "") -> tuple[int, list]:
+        output = StringIO()
+        code = run(
+            ["--file", str(self.file_path), *argv], StringIO(stdin), output
+        )
+        lines = output.getvalue().splitlines()
+        return code, [json.loads(line) for line in lines]
+
+    def test_single_command(self):
+        """Тест: Команда печатает результат одной строкой JSON."""
+        code, responses = self.run_commands("get", "2")
+        self.assertEqual(code, 0)
+        self.assertEqual(
+            responses,
+            [{"command": "get", "result": self.sample_data[1], "ok": True}],
+        )
+
+    def test_command_error(self):
+        """Тест: Ошибка команды выводится в JSON с кодом завершения 1."""
+        code, responses = self.run_commands("get", "10")
+        self.assertEqual(code, 1)
+        self.assertFalse(responses[0]["ok"])
+        self.assertIn("не найдена", responses[0]["error"])
+
+    def test_script_saves_once(self):
+        """Тест: Команды скрипта выполняются с одним сохранением в конце."""
+        script = "\n".join(
+            [
+                "# комментарий",
+                'add "Новая книга" Автор 2000',
+                "status 1 borrowed",
+                "get x",
+                "bulk-status 2-3 выдана",
+            ]
+        )
+        with patch.object(
+            JsonFileManager,
+            "save",
+            autospec=True,
+            side_effect=JsonFileManager.save,
+        ) as save:
+            code, responses = self.run_commands("script", stdin=script)
+        save.assert_called_once()
+        self.assertEqual(code, 1)
+        self.assertEqual([r["line"] for r in responses], [2, 3, 4, 5])
+        self.assertEqual(
+            [r["ok"] for r in responses], [True, True, False, True]
+        )
+        self.assertEqual(
+            responses[3]["result"],
+            {"updated": [2, 3], "errors": {}},
+        )
+        data = self.file_manager.load()
+        self.assertEqual(len(data), 3)
+        self.assertTrue(
+            all(item["status"] == Status.BORROWED.value for item in data)
+        )
+
+    def test_loan_commands(self):
+        """Тест: Выдача читателю и запросы по срокам возврата."""
+        script = "\n".join(
+            [
+                "status 1 borrowed --borrower Иван --due 2000-01-01",
+                "bulk-status 2 borrowed --borrower Петр",
+                "overdue",
+                "due 30",
+            ]
+        )
+        code, responses = self.run_commands("script", stdin=script)
+        self.assertEqual(code, 1)
+        self.assertIn("Срок возврата", responses[0]["error"])
+        self.assertEqual(responses[2]["result"], [])
+        self.assertEqual(
+            [loan["book_id"] for loan in responses[3]["result"]], [2]
+        )
+
+    def test_columnar_store(self):
+        """Тест: Команды работают с колоночным хранилищем."""
+        code, responses = self.run_commands(
+            "--store", "columnar", "search", "year", "1949"
+        )
+        self.assertEqual(code, 0)
+        self.assertEqual(responses[0]["result"], [self.sample_data[1]])
+
+    def test_suggest(self):
+        """Тест: Команда автодополнения."""
+        code, responses = self.run_commands(
+            "suggest", "author", "дж", "--limit", "1"
+        )
+        self.assertEqual(code, 0)
+        self.assertEqual(responses[0]["result"], ["Джордж Оруэлл"])
+
+    def test_parse_ids(self):
+        """Тест: Разбор списка ID с диапазонами."""
+        self.assertEqual(parse_ids("1, 3-5,8"), [1, 3, 4, 5, 8])
+        for value in ("1,x", "5-3", "1-1000000000", "1-60000,1-60000"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_ids(value)
@@ -0,0 +1,67 @@
+import csv
+import json
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from unittest import TestCase
+
+from books import Book, Status
+from exporters import export_books
+
+
+class TestExporters(TestCase):
+    """Тестирование потокового экспорта книг."""
+
+    def setUp(self):
+        self.books = [
+            Book(
+                id=1,
+                title="Преступление и наказание",
+                author="Федор Достоевский",
+                year=1866,
+                status=Status.BORROWED.value,
+            ),
+            Book(id=2, title="1984", author="Джордж Оруэлл", year=1949),
+        ]
+        with NamedTemporaryFile(delete=False) as temp_file:
+            self.filename = Path(temp_file.name)
+
+    def tearDown(self):
+        self.filename.unlink(missing_ok=True)
+
+    def test_export_csv(self):
+        """Тест: Экспорт в CSV с заголовком."""
+        count = export_books(iter(self.books), self.filename, "csv")
+        self.assertEqual(count, len(self.books))
+        with self.filename.open(encoding="utf-8", newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(rows[0]["title"], self.books[0].title)
+        self.assertEqual(rows[1]["year"], str(self.books[1].year))
+
+    def test_export_jsonl(self):
+        """Тест: Экспорт в JSON Lines, по одной книге в строке."""
+        export_books(iter(self.books), self.filename, "jsonl")
+        lines = self.filename.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [book.to_dict() for book in self.books],
+        )
+
+    def test_export_json(self):
+        """Тест: Экспорт в JSON совпадает с json.dump с отступами."""
+        for books in (self.books, []):
+            with self.subTest(count=len(books)):
+                count = export_books(iter(books), self.filename, "json")
+                self.assertEqual(count, len(books))
+                expected = json.dumps(
+                    [book.to_dict() for book in books],
+                    ensure_ascii=False,
+                    indent=4,
+                )
+                self.assertEqual(
+                    self.filename.read_text(encoding="utf-8"), expected
+                )
+
+    def test_export_unknown_format(self):
+        """Тест: Неизвестный формат вызывает исключение ValueError."""
+        with self.assertRaises(ValueError):
+            export_books(self.books, self.filename, "xml")
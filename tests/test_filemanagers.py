@@ -117,3 +117,111 @@ class TestFileManagerLoad(TestCase):
         result = manager.load()
         self.assertIsInstance(result, list)
         self.assertEqual(len(result), 0)
+
+
+class TestFileManagerIndex(TestCase):
+    """Тестирование индекса смещений записей."""
+
+    def setUp(self):
+        self.sample_data = [
+            {
+                "id": 1,
+                "title": "Преступление и наказание",
+                "author": "Федор Достоевский",
+                "year": 1866,
+                "status": Status.AVAILABLE.value,
+            },
+            {
+                "id": 3,
+                "title": "1984",
+                "author": "Джордж Оруэлл",
+                "year": 1949,
+                "status": Status.BORROWED.value,
+            },
+        ]
+        with NamedTemporaryFile(delete=False, suffix=".json") as temp_file:
+            self.filename = Path(temp_file.name)
+        self.manager = JsonFileManager(self.filename)
+
+    def tearDown(self):
+        self.filename.unlink(missing_ok=True)
+        self.manager.index_filepath.unlink(missing_ok=True)
+
+    def test_save_keeps_json_format(self):
+        """Тест: Формат файла совпадает с json.dump с отступами."""
+        self.manager.save(self.sample_data)
+        expected = json.dumps(self.sample_data, ensure_ascii=False, indent=4)
+        self.assertEqual(self.filename.read_text(encoding="utf-8"), expected)
+
+    def test_load_record_by_index(self):
+        """Тест: Запись читается по смещениям из индекса."""
+        self.manager.save(self.sample_data)
+        index = self.manager.load_index()
+        self.assertEqual(len(index), len(self.sample_data))
+        self.assertEqual(index.next_id, 4)
+        self.assertIsNone(index.get(2))
+        for item in self.sample_data:
+            with self.subTest(id=item["id"]):
+                record = self.manager.load_record(*index.get(item["id"]))
+                self.assertEqual(record, item)
+
+    def test_stale_index_is_rebuilt(self):
+        """Тест: Устаревший индекс перестраивается по файлу данных."""
+        self.manager.save(self.sample_data)
+        with self.filename.open("w", encoding="utf-8") as file:
+            json.dump(self.sample_data[::-1], file, ensure_ascii=False)
+        index = self.manager.load_index()
+        for item in self.sample_data:
+            with self.subTest(id=item["id"]):
+                record = self.manager.load_record(*index.get(item["id"]))
+                self.assertEqual(record, item)
+
+
+class TestFileManagerSnapshot(TestCase):
+    """Тестирование снимка разобранного каталога."""
+
+    def setUp(self):
+        with NamedTemporaryFile(delete=False, suffix=".json") as temp_file:
+            self.filename = Path(temp_file.name)
+        self.manager = JsonFileManager(self.filename)
+        self.manager.save([{"id": 1}])
+
+    def tearDown(self):
+        self.filename.unlink(missing_ok=True)
+        self.manager.index_filepath.unlink(missing_ok=True)
+        self.manager.snapshot_filepath.unlink(missing_ok=True)
+
+    def test_snapshot_roundtrip(self):
+        """Тест: Снимок читается, пока файл данных не изменился."""
+        self.assertIsNone(self.manager.load_snapshot("books"))
+        data, key = self.manager.load_with_snapshot_key("books")
+        self.assertEqual(data, [{"id": 1}])
+        self.manager.save_snapshot(key, ["payload"])
+        self.assertEqual(self.manager.load_snapshot("books"), ["payload"])
+        self.assertIsNone(self.manager.load_snapshot("other"))
+
+    def test_snapshot_invalidated_by_changes(self):
+        """Тест: Снимок недействителен после изменения файла данных."""
+        _, key = self.manager.load_with_snapshot_key("books")
+        self.manager.save_snapshot(key, ["payload"])
+        self.manager.save([{"id": 2}])
+        self.assertIsNone(self.manager.load_snapshot("books"))
+
+    def test_snapshot_key_matches_parsed_data(self):
+        """
+        Тест: Если файл заменили во время загрузки, снимок старых данных
+        не выдается за снимок нового файла.
+        """
+        decode = self.manager._decode
+
+        def replace_then_decode(raw):
+            JsonFileManager(self.filename).save([{"id": 2}])
+            return decode(raw)
+
+        with patch.object(self.manager, "_decode", replace_then_decode):
+            data, key = self.manager.load_with_snapshot_key("books")
+        self.assertEqual(data, [{"id": 1}])
+        self.manager.save_snapshot(key, data)
+        self.assertIsNone(self.manager.load_snapshot("books"))
+        data, key = self.manager.load_with_snapshot_key("books")
+        self.assertEqual(data, [{"id": 2}])
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+from unittest import TestCase
+
+from books import Book, Loan
+from indexes import DueDateIndex, PrefixIndex, SortedIndex
+
+
+class TestSortedIndex(TestCase):
+    """Тестирование поддерживаемого порядка сортировки."""
+
+    def setUp(self):
+        self.books = [
+            Book(id=1, title="B", author="Автор", year=2000),
+            Book(id=2, title="A", author="Автор", year=1990),
+            Book(id=3, title="C", author="Автор", year=2000),
+        ]
+        self.index = SortedIndex(lambda book: book.year, self.books)
+
+    def test_ids_in_order(self):
+        """Тест: Равные ключи упорядочиваются по id."""
+        self.assertEqual(self.index.ids(), [2, 1, 3])
+        self.assertEqual(self.index.ids(reverse=True), [3, 1, 2])
+
+    def test_ids_page(self):
+        """Тест: Страница выбирается по смещению и размеру."""
+        self.assertEqual(self.index.ids(1, 1), [1])
+        self.assertEqual(self.index.ids(1, 5, reverse=True), [1, 2])
+        self.assertEqual(self.index.ids(3, 1), [])
+
+    def test_add_and_remove(self):
+        """Тест: Индекс обновляется при добавлении и удалении книг."""
+        book = Book(id=4, title="D", author="Автор", year=1995)
+        self.index.add(book)
+        self.assertEqual(self.index.ids(), [2, 4, 1, 3])
+        self.index.remove(self.books[0])
+        self.assertEqual(self.index.ids(), [2, 4, 3])
+        self.assertEqual(len(self.index), 3)
+
+
+class TestPrefixIndex(TestCase):
+    """Тестирование префиксного индекса для автодополнения."""
+
+    def setUp(self):
+        self.books = [
+            Book(id=1, title="Преступление и наказание", author="А", year=1),
+            Book(id=2, title="Приключения", author="А", year=1),
+            Book(id=3, title="Наказание", author="А", year=1),
+            Book(id=4, title="Приключения", author="Б", year=1),
+        ]
+        self.index = PrefixIndex("title", self.books)
+
+    def test_suggest_by_value_and_word(self):
+        """Тест: Префикс ищется в начале значения и каждого слова."""
+        self.assertEqual(
+            self.index.suggest("пр", 10),
+            ["Преступление и наказание", "Приключения"],
+        )
+        self.assertEqual(
+            self.index.suggest("наказ", 10),
+            ["Преступление и наказание", "Наказание"],
+        )
+        self.assertEqual(
+            self.index.suggest("пр", 1), ["Преступление и наказание"]
+        )
+        self.assertEqual(self.index.suggest("нет", 10), [])
+
+    def test_add_and_remove(self):
+        """Тест: Значение исчезает после удаления всех книг с ним."""
+        self.index.remove(self.books[1])
+        self.assertEqual(self.index.suggest("прик", 10), ["Приключения"])
+        self.index.remove(self.books[3])
+        self.assertEqual(self.index.suggest("прик", 10), [])
+        self.index.add(Book(id=5, title="Призрак", author="В", year=1))
+        self.assertEqual(self.index.suggest("при", 10), ["Призрак"])
+        self.assertEqual(len(self.index), 4)
+
+
+class TestDueDateIndex(TestCase):
+    """Тестирование очереди выдач по сроку возврата."""
+
+    def setUp(self):
+        self.today = date(2024, 1, 10)
+        self.loans = [
+            Loan(id, "Читатель", self.today, self.today + timedelta(days))
+            for id, days in ((1, 5), (2, 1), (3, 10), (4, 1))
+        ]
+        self.index = DueDateIndex(self.loans)
+
+    def test_due_until(self):
+        """Тест: Выдачи возвращаются в порядке срока до границы."""
+        limit = self.today + timedelta(days=5)
+        self.assertEqual(self.index.due_until(limit), [2, 4, 1])
+        self.assertEqual(self.index.due_until(self.today), [])
+
+    def test_remove_and_update(self):
+        """Тест: Удаленные и перенесенные выдачи не попадают в ответ."""
+        self.index.remove(2)
+        loan = Loan(1, "Читатель", self.today, self.today)
+        self.index.add(loan)
+        self.index.add(loan)
+        limit = self.today + timedelta(days=5)
+        self.assertEqual(self.index.due_until(limit), [1, 4])
+        self.assertEqual(len(self.index), 3)
@@ -1,15 +1,22 @@
-from unittest import TestCase
+from datetime import date, timedelta
+from unittest import TestCase, skipIf
 from unittest.mock import MagicMock, patch
 
-from books import Book, Status
+from books import Book, Loan, Status
 from libraries import LibraryManager
+import main
 from main import (
     add_book,
+    completion,
     delete_book,
     display_book_by_id,
+    display_due_loans,
     display_books,
+    display_sorted_books,
+    export_catalog,
     search_book,
     update_status_of_book,
+    update_status_of_books,
 )
 
 
@@ -126,7 +133,7 @@ class TestInterface(TestCase):
         self.library.delete_book.assert_called_once_with(100)
         mock_print.assert_called_once_with(f"\nОшибка: {msg_error}\n")
 
-    @patch("builtins.input", side_effect=["1", "2"])
+    @patch("builtins.input", side_effect=["1", "2", ""])
     @patch("builtins.print")
     def test_update_book_status(self, mock_print, mock_input):
         """Тест: Успешное обновление статуса книги."""
@@ -138,6 +145,20 @@ class TestInterface(TestCase):
         self.library.update_book_status.assert_called_once_with(1, "выдана")
         mock_print.assert_any_call(f"\nСтатус книги изменен:\n{self.book}\n")
 
+    @patch("builtins.input", side_effect=["1", "2", "Иван", "7"])
+    @patch("builtins.print")
+    def test_update_book_status_with_loan(self, mock_print, mock_input):
+        """Тест: Выдача книги читателю со сроком возврата."""
+        self.library.loan_days = 14
+        self.library.update_book_status.return_value = self.book
+        update_status_of_book(self.library)
+        self.library.update_book_status.assert_called_once_with(
+            1,
+            "выдана",
+            borrower="Иван",
+            due_date=date.today() + timedelta(days=7),
+        )
+
     @patch("builtins.input", side_effect=["not number"])
     @patch("builtins.print")
     def test_update_status_by_id_invalid_input(self, mock_print, mock_input):
@@ -148,7 +169,7 @@ class TestInterface(TestCase):
             "\nОшибка: Ввод должен быть числом.\n"
         )
 
-    @patch("builtins.input", side_effect=["100", "2"])
+    @patch("builtins.input", side_effect=["100", "2", ""])
     @patch("builtins.print")
     def test_update_status_of_non_existing_book(self, mock_print, mock_input):
         """Тест: Обработка обновления статуса несуществующей книги."""
@@ -176,3 +197,107 @@ class TestInterface(TestCase):
         search_book(self.library)
         self.library.search_book.assert_not_called()
         mock_print.assert_any_call("\nОшибка: Неверный выбор.\n")
+
+    @patch("builtins.input", side_effect=["4", "n"])
+    @patch("builtins.print")
+    def test_display_sorted_books(self, mock_print, mock_input):
+        """Тест: Отображение книг в выбранном порядке."""
+        books = [self.book]
+        self.library.sort_fields = ("id", "title", "author", "year")
+        self.library.get_sorted_books.return_value = books
+        display_sorted_books(self.library)
+        self.library.get_sorted_books.assert_called_once_with(
+            "year", False, 0, 10
+        )
+        mock_print.assert_any_call("\n\n".join(str(book) for book in books))
+
+    @patch("builtins.input", side_effect=["1", "y", "q"])
+    @patch("builtins.print")
+    @patch("main.page_size", 1)
+    def test_display_sorted_books_pages(self, mock_print, mock_input):
+        """Тест: Постраничный вывод прерывается по команде пользователя."""
+        self.library.sort_fields = ("id", "title", "author", "year")
+        self.library.get_sorted_books.return_value = [self.book]
+        display_sorted_books(self.library)
+        self.library.get_sorted_books.assert_called_once_with("id", True, 0, 1)
+
+    @patch("builtins.input", side_effect=["1, 3-4", "2"])
+    @patch("builtins.print")
+    def test_update_status_of_books(self, mock_print, mock_input):
+        """Тест: Обновление статуса нескольких книг с отчетом об ошибках."""
+        msg_error = "Книга с id `4` не найдена."
+        self.library.update_books_status.return_value = (
+            [self.book, self.book],
+            {4: msg_error},
+        )
+        update_status_of_books(self.library)
+        self.library.update_books_status.assert_called_once_with(
+            [(1, "выдана"), (3, "выдана"), (4, "выдана")]
+        )
+        mock_print.assert_any_call("\nСтатус изменен у 2 книг.\n")
+        mock_print.assert_any_call(f"Ошибка: {msg_error}")
+
+    @patch("builtins.input", side_effect=["1, x"])
+    @patch("builtins.print")
+    def test_update_status_of_books_invalid_ids(self, mock_print, mock_input):
+        """Тест: Обработка некорректного списка ID."""
+        update_status_of_books(self.library)
+        self.library.update_books_status.assert_not_called()
+        mock_print.assert_called_once_with(
+            "\nОшибка: Ввод должен быть списком чисел или диапазонов.\n"
+        )
+
+    @patch("main.export_books", return_value=1)
+    @patch("builtins.input", side_effect=["2", "books.jsonl", "n"])
+    @patch("builtins.print")
+    def test_export_catalog(self, mock_print, mock_input, mock_export):
+        """Тест: Экспорт всего каталога в выбранном формате."""
+        books = iter([self.book])
+        self.library.iter_books.return_value = books
+        export_catalog(self.library)
+        mock_export.assert_called_once_with(books, "books.jsonl", "jsonl")
+        mock_print.assert_any_call(
+            "\nЭкспортировано книг: 1 в файл books.jsonl\n"
+        )
+
+    @patch("main.export_books", return_value=1)
+    @patch("builtins.input", side_effect=["1", "out.csv", "y", "2", "Лев"])
+    @patch("builtins.print")
+    def test_export_search_result(self, mock_print, mock_input, mock_export):
+        """Тест: Экспорт результатов поиска."""
+        self.library.search_fields = ("title", "author", "year")
+        export_catalog(self.library)
+        self.library.iter_search_book.assert_called_once_with("author", "Лев")
+        self.library.iter_books.assert_not_called()
+        mock_export.assert_called_once_with(
+            self.library.iter_search_book.return_value, "out.csv", "csv"
+        )
+
+    @patch("builtins.input", side_effect=["3"])
+    @patch("builtins.print")
+    def test_display_due_loans(self, mock_print, mock_input):
+        """Тест: Отображение просроченных и скоро возвращаемых книг."""
+        today = date.today()
+        overdue = Loan(1, "Иван", today - timedelta(days=20), today)
+        self.library.overdue_loans.return_value = [overdue]
+        self.library.due_loans.return_value = []
+        self.library.get_book.return_value = self.book
+        display_due_loans(self.library)
+        self.library.due_loans.assert_called_once_with(3)
+        mock_print.assert_any_call("\nПросрочено книг: 1\n")
+        mock_print.assert_any_call(
+            f"id: 1, {self.book.title} - Иван, "
+            f"вернуть до {today.isoformat()}"
+        )
+
+    @skipIf(main.readline is None, "нет модуля readline")
+    def test_completion(self):
+        """Тест: Автодополнение по Tab и восстановление прежнего."""
+        readline = main.readline
+        previous = readline.get_completer()
+        with completion(lambda text: [text + "1", text + "2"]):
+            completer = readline.get_completer()
+            self.assertEqual(completer("Пр", 0), "Пр1")
+            self.assertEqual(completer("Пр", 1), "Пр2")
+            self.assertIsNone(completer("Пр", 2))
+        self.assertIs(readline.get_completer(), previous)
@@ -1,11 +1,14 @@
 import json
+from datetime import date, timedelta
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 from unittest import TestCase
+from unittest.mock import patch
 
 from books import Book, Status
 from filemanagers import JsonFileManager
 from libraries import LibraryManager
+from stores import ColumnarBookStore
 
 
 class TestLibraryManager(TestCase):
@@ -43,6 +46,11 @@ class TestLibraryManager(TestCase):
     def tearDown(self):
         """Удаляем временный файл."""
         self.file_path.unlink(missing_ok=True)
+        file_manager = self.library_manager.file_manager
+        file_manager.index_filepath.unlink(missing_ok=True)
+        file_manager.snapshot_filepath.unlink(missing_ok=True)
+        file_manager.loans_filepath.unlink(missing_ok=True)
+        file_manager.changes_filepath.unlink(missing_ok=True)
 
     def test_get_books(self):
         """Тест: Получение всех книг."""
@@ -186,7 +194,278 @@ class TestLibraryManager(TestCase):
                 self.assertIsInstance(first_book, Book)
                 self.assertEqual(first_book.title, search_data["title"])
 
+    def test_lazy_get_book(self):
+        """Тест: В ленивом режиме книга создается при первом обращении."""
+        file_manager = self.library_manager.file_manager
+        self.library_manager._save_books()
+        library = LibraryManager(Book, file_manager, lazy=True)
+        self.assertEqual(len(library._books), 0)
+        data = self.sample_data[1]
+        book = library.get_book(data["id"])
+        self.assertEqual(list(library._books), [data["id"]])
+        self.assertEqual(book.title, data["title"])
+        with self.assertRaises(ValueError):
+            library.get_book(10)
+
+    def test_lazy_without_record_loading(self):
+        """
+        Тест: Если хранилище не читает отдельные записи, книга берется
+        из целиком загруженного каталога.
+        """
+        file_manager = self.library_manager.file_manager
+        self.library_manager._save_books()
+        library = LibraryManager(Book, file_manager, lazy=True)
+        data = self.sample_data[1]
+        with patch.object(file_manager, "load_record", return_value=None):
+            book = library.get_book(data["id"])
+        self.assertEqual(book.title, data["title"])
+        self.assertIsNone(library._index)
+        self.assertEqual(len(library._books), len(self.sample_data))
+
+    def test_lazy_get_book_crlf(self):
+        """Тест: Ленивая загрузка файла с переводами строк CRLF."""
+        file_manager = self.library_manager.file_manager
+        text = json.dumps(self.sample_data, ensure_ascii=False, indent=4)
+        file_manager.filepath.write_bytes(
+            text.replace("\n", "\r\n").encode("utf-8")
+        )
+        library = LibraryManager(Book, file_manager, lazy=True)
+        for data in self.sample_data:
+            with self.subTest(id=data["id"]):
+                self.assertEqual(
+                    library.get_book(data["id"]).title, data["title"]
+                )
+        self.assertIsNotNone(library._index)
+
+    def test_lazy_index_mismatch(self):
+        """Тест: Если индекс разошелся с файлом, каталог грузится целиком."""
+        file_manager = self.library_manager.file_manager
+        self.library_manager._save_books()
+        library = LibraryManager(Book, file_manager, lazy=True)
+        data = self.sample_data[1]
+        with patch.object(
+            file_manager, "load_record", return_value={"id": 0}
+        ):
+            book = library.get_book(data["id"])
+        self.assertEqual(book.title, data["title"])
+        self.assertIsNone(library._index)
+
+    def test_lazy_full_load_on_scan(self):
+        """Тест: Операции просмотра догружают весь каталог."""
+        file_manager = self.library_manager.file_manager
+        library = LibraryManager(Book, file_manager, lazy=True)
+        book = library.get_book(self.sample_data[0]["id"])
+        books = library.get_books()
+        self.assertEqual(len(books), len(self.sample_data))
+        self.assertIs(books[0], book)
+        new_book = library.add_book("New book", "Author", 2000)
+        self.assertEqual(new_book.id, len(self.sample_data) + 1)
+
+    def test_warm_start_uses_snapshot(self):
+        """Тест: Повторный запуск берет книги из снимка без валидации."""
+        file_manager = self.library_manager.file_manager
+        with patch.object(Book, "from_dict") as from_dict:
+            library = LibraryManager(Book, file_manager)
+        from_dict.assert_not_called()
+        self.assertEqual(
+            [book.to_dict() for book in library.get_books()],
+            [book.to_dict() for book in self.library_manager.get_books()],
+        )
+
+    def test_update_books_status(self):
+        """Тест: Обновление статусов нескольких книг с одним сохранением."""
+        new_status = Status.BORROWED.value
+        changes = [(1, new_status), (10, new_status), (2, "incorrect")]
+        with patch.object(
+            self.library_manager,
+            "_save_books",
+            wraps=self.library_manager._save_books,
+        ) as save_books:
+            updated, errors = self.library_manager.update_books_status(
+                changes
+            )
+        save_books.assert_called_once()
+        self.assertEqual([book.id for book in updated], [1])
+        self.assertEqual(updated[0].status, new_status)
+        self.assertEqual(set(errors), {10, 2})
+        book = self.library_manager.get_book(2)
+        self.assertEqual(book.status, Status.AVAILABLE.value)
+
+    def test_update_books_status_without_changes(self):
+        """Тест: Каталог не сохраняется, если ни одна книга не изменена."""
+        with patch.object(self.library_manager, "_save_books") as save_books:
+            updated, errors = self.library_manager.update_books_status(
+                [(10, Status.BORROWED.value)]
+            )
+        save_books.assert_not_called()
+        self.assertEqual(updated, [])
+        self.assertIn(10, errors)
+
+    def test_borrow_book_with_loan(self):
+        """Тест: Выдача книги читателю создает и сохраняет запись о выдаче."""
+        due_date = date.today() + timedelta(days=3)
+        self.library_manager.update_book_status(
+            1, Status.BORROWED.value, borrower="Иван", due_date=due_date
+        )
+        loan = self.library_manager.get_loan(1)
+        self.assertEqual(loan.borrower, "Иван")
+        self.assertEqual(loan.due_date, due_date)
+        library = LibraryManager(Book, self.library_manager.file_manager)
+        self.assertEqual(library.get_loan(1), loan)
+        library.update_book_status(1, Status.AVAILABLE.value)
+        self.assertIsNone(library.get_loan(1))
+        library = LibraryManager(Book, self.library_manager.file_manager)
+        self.assertIsNone(library.get_loan(1))
+
+    def test_borrow_book_with_incorrect_loan(self):
+        """Тест: Некорректная выдача не изменяет статус книги."""
+        yesterday = date.today() - timedelta(days=1)
+        for borrower, due_date in (("", None), ("Иван", yesterday)):
+            with self.subTest(borrower=borrower), self.assertRaises(
+                ValueError
+            ):
+                self.library_manager.update_book_status(
+                    1, Status.BORROWED.value, borrower, due_date
+                )
+        book = self.library_manager.get_book(1)
+        self.assertEqual(book.status, Status.AVAILABLE.value)
+
+    def test_overdue_and_due_loans(self):
+        """Тест: Запросы просроченных выдач и выдач на ближайшие дни."""
+        today = date.today()
+        self.library_manager.update_book_status(
+            1, Status.BORROWED.value, "Иван", today + timedelta(days=2)
+        )
+        self.library_manager.update_book_status(
+            2, Status.BORROWED.value, "Петр", today + timedelta(days=5)
+        )
+        later = today + timedelta(days=4)
+        overdue = self.library_manager.overdue_loans(later)
+        self.assertEqual([loan.book_id for loan in overdue], [1])
+        due = self.library_manager.due_loans(1, later)
+        self.assertEqual([loan.book_id for loan in due], [2])
+        due = self.library_manager.due_loans(10)
+        self.assertEqual([loan.book_id for loan in due], [1, 2])
+        self.library_manager.delete_book(1)
+        self.assertEqual(self.library_manager.overdue_loans(later), [])
+
+    def test_get_sorted_books(self):
+        """Тест: Получение книг, упорядоченных по полю, постранично."""
+        books = self.library_manager.get_sorted_books("year")
+        self.assertEqual([book.year for book in books], [1866, 1949])
+        books = self.library_manager.get_sorted_books("title", limit=1)
+        self.assertEqual([book.title for book in books], ["1984"])
+        books = self.library_manager.get_sorted_books(
+            "year", reverse=True, offset=1
+        )
+        self.assertEqual([book.year for book in books], [1866])
+        with self.assertRaises(ValueError):
+            self.library_manager.get_sorted_books("status")
+
+    def test_sorted_books_follow_mutations(self):
+        """Тест: Порядок сортировки обновляется при изменениях каталога."""
+        self.library_manager.get_sorted_books("year")
+        new_book = self.library_manager.add_book("New book", "Author", 1900)
+        books = self.library_manager.get_sorted_books("year")
+        self.assertEqual([book.year for book in books], [1866, 1900, 1949])
+        self.library_manager.delete_book(new_book.id)
+        books = self.library_manager.get_sorted_books("year")
+        self.assertEqual([book.year for book in books], [1866, 1949])
+
+    def test_status_update_keeps_sorted_books(self):
+        """Тест: Изменение статуса не перестраивает порядки сортировки."""
+        self.library_manager.get_sorted_books("title")
+        with patch("indexes.SortedIndex.remove") as mock_remove:
+            self.library_manager.update_books_status(
+                [(1, Status.BORROWED.value), (2, Status.BORROWED.value)]
+            )
+        mock_remove.assert_not_called()
+        books = self.library_manager.get_sorted_books("title")
+        self.assertEqual([book.id for book in books], [2, 1])
+        self.assertEqual(books[1].status, Status.BORROWED.value)
+
+    def test_top_books(self):
+        """Тест: Получение первых k книг в порядке поля."""
+        self.library_manager.add_book("New book", "Author", 2000)
+        newest = self.library_manager.top_books("year", 2, reverse=True)
+        self.assertEqual([book.year for book in newest], [2000, 1949])
+        self.library_manager.get_sorted_books("year")
+        self.assertEqual(
+            self.library_manager.top_books("year", 2, reverse=True), newest
+        )
+        with self.assertRaises(ValueError):
+            self.library_manager.top_books("year", -1)
+
+    def test_search_book_normalized(self):
+        """Тест: Поиск не зависит от регистра и написания ё."""
+        result = self.library_manager.search_book("author", "ФЁДОР")
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].id, self.sample_data[0]["id"])
+
+    def test_iter_search_book(self):
+        """Тест: Потоковый поиск проверяет поле сразу при вызове."""
+        result = self.library_manager.iter_search_book("year", 1949)
+        self.assertEqual([book.year for book in result], [1949])
+        with self.assertRaises(ValueError):
+            self.library_manager.iter_search_book("invalid_field", "test")
+
     def test_search_invalid_field(self):
         """Тест: Поиск по недопустимому полю выбрасывает исключение."""
         with self.assertRaises(ValueError):
             self.library_manager.search_book("invalid_field", "test")
+
+    def test_suggest(self):
+        """Тест: Варианты автодополнения без учета регистра и ё."""
+        self.assertEqual(
+            self.library_manager.suggest("author", "фЁд"),
+            ["Федор Достоевский"],
+        )
+        self.assertEqual(
+            self.library_manager.suggest("title", "наказ"),
+            ["Преступление и наказание"],
+        )
+        self.assertEqual(self.library_manager.suggest("title", "1", 0), [])
+        for field_name, limit in (("year", 10), ("title", -1)):
+            with self.subTest(field_name=field_name, limit=limit):
+                with self.assertRaises(ValueError):
+                    self.library_manager.suggest(field_name, "1", limit)
+
+    def test_suggest_follows_changes(self):
+        """Тест: Автодополнение учитывает добавленные и удаленные книги."""
+        self.assertEqual(
+            self.library_manager.suggest("author", "д"),
+            ["Джордж Оруэлл", "Федор Достоевский"],
+        )
+        book = self.library_manager.add_book(
+            "Бесы", "Федор Достоевский", 1872
+        )
+        self.library_manager.update_book_status(book.id, Status.BORROWED.value)
+        self.library_manager.delete_book(self.sample_data[0]["id"])
+        self.assertEqual(self.library_manager.suggest("title", "бе"), ["Бесы"])
+        self.assertEqual(self.library_manager.suggest("title", "преступ"), [])
+        self.library_manager.delete_book(book.id)
+        self.assertEqual(
+            self.library_manager.suggest("author", "д"), ["Джордж Оруэлл"]
+        )
+
+
+class TestColumnarLibraryManager(TestLibraryManager):
+    """Тесты LibraryManager с колоночным хранилищем книг."""
+
+    def setUp(self):
+        super().setUp()
+        self.library_manager = LibraryManager(
+            Book,
+            JsonFileManager(self.file_path),
+            store_class=ColumnarBookStore,
+        )
+
+    def test_get_books_by_status(self):
+        """Тест: Получение книг по статусу."""
+        self.library_manager.update_book_status(2, Status.BORROWED.value)
+        books = self.library_manager.get_books_by_status(
+            Status.BORROWED.value
+        )
+        self.assertEqual([book.id for book in books], [2])
+        with self.assertRaises(ValueError):
+            self.library_manager.get_books_by_status("incorrect")
@@ -0,0 +1,157 @@
+import gc
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Iterator
+from unittest import TestCase
+
+from benchmarks import make_catalog
+from books import Book
+from libraries import LibraryManager
+from stores import ColumnarBookStore, DictBookStore
+
+
+@contextmanager
+def traced() -> Iterator[dict[str, int]]:
+    """
+    Замеряет память, выделенную в блоке: `current` - оставшаяся после
+    блока, `peak` - наибольшая во время блока, в байтах.
+    """
+    gc.collect()
+    usage = {}
+    tracemalloc.start()
+    try:
+        yield usage
+        usage["current"], usage["peak"] = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+
+class TestMemoryBudget(TestCase):
+    """
+    Бюджеты памяти на синтетическом каталоге. Бюджеты заданы в байтах на
+    книгу с запасом около полутора раз от измеренных значений: тест падает,
+    если изменение заметно увеличивает расход памяти.
+    """
+
+    count = 5_000
+    store_class = DictBookStore
+    # Память, занимаемая одной загруженной книгой
+    book_bytes = 1_000
+    # Пиковая память на книгу при загрузке, сохранении и получении списка.
+    # Загрузка из снимка и разбор файла с валидацией замеряются отдельно
+    initialize_peak = 1_300
+    cold_initialize_peak = 2_000
+    save_peak = 600
+    get_books_peak = 12
+    # Поиск не копирует каталог: память растет только с числом найденных
+    search_peak = 16_384
+    search_peak_per_book = 1_024
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = TemporaryDirectory()
+        cls.file_manager = make_catalog(
+            Path(cls.directory.name) / "library.json", cls.count
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.library = LibraryManager(
+            Book, self.file_manager, store_class=self.store_class
+        )
+
+    def assertBudget(self, used: int, budget: int, what: str):
+        self.assertLessEqual(
+            used, budget, f"{what}: {used} байт при бюджете {budget}"
+        )
+
+    def drop_snapshot(self):
+        """Удаляет снимок: следующая загрузка разбирает файл каталога."""
+        self.file_manager.snapshot_filepath.unlink(missing_ok=True)
+
+    def test_bytes_per_loaded_book(self):
+        """Тест: Память на одну загруженную книгу."""
+        del self.library
+        for cold in (False, True):
+            with self.subTest(cold=cold):
+                if cold:
+                    self.drop_snapshot()
+                with traced() as usage:
+                    library = LibraryManager(
+                        Book, self.file_manager, store_class=self.store_class
+                    )
+                self.assertEqual(len(library.get_books()), self.count)
+                self.assertBudget(
+                    usage["current"] // self.count, self.book_bytes, "книга"
+                )
+                del library
+
+    def test_initialize_books_peak(self):
+        """Тест: Пиковая память загрузки каталога из снимка."""
+        with traced() as usage:
+            self.library._initialize_books()
+        self.assertBudget(
+            usage["peak"] // self.count,
+            self.initialize_peak,
+            "_initialize_books",
+        )
+
+    def test_initialize_books_cold_peak(self):
+        """Тест: Пиковая память загрузки каталога с разбором файла."""
+        self.drop_snapshot()
+        with traced() as usage:
+            self.library._initialize_books()
+        self.assertBudget(
+            usage["peak"] // self.count,
+            self.cold_initialize_peak,
+            "_initialize_books без снимка",
+        )
+
+    def test_save_books_peak(self):
+        """Тест: Пиковая память сохранения каталога."""
+        with traced() as usage:
+            self.library._save_books()
+        self.assertBudget(
+            usage["peak"] // self.count, self.save_peak, "_save_books"
+        )
+
+    def test_get_books_does_not_copy_books(self):
+        """Тест: Список книг содержит ссылки, а не копии книг."""
+        with traced() as usage:
+            books = self.library.get_books()
+        self.assertEqual(len(books), self.count)
+        self.assertBudget(
+            usage["peak"] // self.count, self.get_books_peak, "get_books"
+        )
+
+    def test_search_book_peak(self):
+        """Тест: Пиковая память поиска зависит от числа найденных книг."""
+        queries = (
+            ("title", "книга номер 1999"),
+            ("author", "автор 999"),
+            ("year", 1900),
+        )
+        for field, query in queries:
+            with self.subTest(field=field):
+                with traced() as usage:
+                    books = self.library.search_book(field, query)
+                self.assertTrue(books)
+                budget = (
+                    self.search_peak + self.search_peak_per_book * len(books)
+                )
+                self.assertBudget(usage["peak"], budget, "search_book")
+
+
+class TestColumnarMemoryBudget(TestMemoryBudget):
+    """Бюджеты памяти колоночного хранилища."""
+
+    store_class = ColumnarBookStore
+    book_bytes = 600
+    initialize_peak = 1_500
+    # Книги создаются из колонок при обращении
+    get_books_peak = 400
@@ -0,0 +1,85 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from benchmarks import make_catalog
+from books import Book, Status
+from libraries import LibraryManager
+from stores import ColumnarBookStore, DictBookStore
+
+
+class TestParallelSearch(TestCase):
+    """Тестирование параллельного поиска в рабочих процессах."""
+
+    store_class = DictBookStore
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        file_manager = make_catalog(
+            Path(self.directory.name) / "library.json", 100
+        )
+        self.library = LibraryManager(
+            Book, file_manager, store_class=self.store_class
+        )
+        self.library.parallel_threshold = 10
+        self.library.search_workers = 3
+        self.sequential = LibraryManager(
+            Book, file_manager, store_class=self.store_class
+        )
+        self.sequential.search_workers = 1
+
+    def tearDown(self):
+        if self.library._parallel is not None:
+            self.library._parallel.close()
+        self.directory.cleanup()
+
+    def assertSameResults(self):
+        queries = (
+            ("title", "номер 1"),
+            ("author", "АВТОР 4"),
+            ("year", 1850),
+            ("title", "нет такой книги"),
+        )
+        for field, query in queries:
+            with self.subTest(field=field, query=query):
+                books = self.library.search_book(field, query)
+                self.assertEqual(
+                    books, self.sequential.search_book(field, query)
+                )
+                ids = [book.id for book in books]
+                self.assertEqual(ids, sorted(ids))
+        for status in Status:
+            with self.subTest(status=status):
+                self.assertEqual(
+                    self.library.get_books_by_status(status.value),
+                    self.sequential.get_books_by_status(status.value),
+                )
+
+    def test_search_uses_workers(self):
+        """Тест: Поиск в большом каталоге выполняют рабочие процессы."""
+        self.assertSameResults()
+        self.assertEqual(len(self.library._parallel), 3)
+        self.assertIsNone(self.sequential._parallel)
+
+    def test_workers_follow_changes(self):
+        """Тест: Изменения каталога передаются рабочим процессам."""
+        self.library.search_book("title", "книга")
+        for library in (self.library, self.sequential):
+            library.add_book("Книга номер 1000", "Автор 4", 1850)
+            library.delete_book(14)
+            library.update_books_status(
+                [(id, Status.BORROWED.value) for id in range(1, 100, 2)]
+            )
+        self.assertSameResults()
+
+    def test_small_catalog_is_searched_sequentially(self):
+        """Тест: Небольшой каталог ищется без рабочих процессов."""
+        self.library.parallel_threshold = 1000
+        self.library.search_book("title", "книга")
+        self.assertIsNone(self.library._parallel)
+
+
+class TestColumnarParallelSearch(TestParallelSearch):
+    """Тестирование параллельного поиска с колоночным хранилищем."""
+
+    store_class = ColumnarBookStore
@@ -0,0 +1,251 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from unittest import TestCase
+
+from books import Book, Status
+from filemanagers import JsonFileManager
+from libraries import LibraryManager
+from replicas import ReplicaLibraryManager
+from stores import ColumnarBookStore
+
+root = Path(__file__).resolve().parent.parent
+
+
+class TestReplicaLibraryManager(TestCase):
+    """Тестирование реплик, следующих за журналом изменений."""
+
+    store_class = None
+
+    def setUp(self):
+        self.sample_data = [
+            {
+                "id": 1,
+                "title": "Преступление и наказание",
+                "author": "Федор Достоевский",
+                "year": 1866,
+                "status": Status.AVAILABLE.value,
+            },
+            {
+                "id": 2,
+                "title": "1984",
+                "author": "Джордж Оруэлл",
+                "year": 1949,
+                "status": Status.AVAILABLE.value,
+            },
+        ]
+        with NamedTemporaryFile(delete=False, suffix=".json") as temp_file:
+            self.file_path = Path(temp_file.name)
+        self.file_manager = JsonFileManager(self.file_path)
+        self.file_manager.save(self.sample_data)
+        self.primary = LibraryManager(
+            Book, JsonFileManager(self.file_path), publish_changes=True
+        )
+        self.replica = self.open_replica()
+
+    def tearDown(self):
+        self.file_path.unlink(missing_ok=True)
+        self.file_manager.index_filepath.unlink(missing_ok=True)
+        self.file_manager.snapshot_filepath.unlink(missing_ok=True)
+        self.file_manager.loans_filepath.unlink(missing_ok=True)
+        self.file_manager.changes_filepath.unlink(missing_ok=True)
+
+    def open_replica(self) -> ReplicaLibraryManager:
+        if self.store_class is None:
+            return ReplicaLibraryManager(Book, JsonFileManager(self.file_path))
+        return ReplicaLibraryManager(
+            Book, JsonFileManager(self.file_path), self.store_class
+        )
+
+    def run_main(self, *argv: str) -> list:
+        result = subprocess.run(
+            [sys.executable, "main.py", "--file", str(self.file_path), *argv],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+        )
+        return [json.loads(line) for line in result.stdout.splitlines()]
+
+    def test_replica_applies_changes(self):
+        """Тест: Реплика применяет добавление, изменение и удаление."""
+        self.replica.get_sorted_books("title")
+        book = self.primary.add_book("Мастер и Маргарита", "Булгаков", 1967)
+        self.primary.update_book_status(1, Status.BORROWED.value)
+        self.primary.delete_book(2)
+        self.assertEqual(len(self.replica.get_books()), 2)
+        self.assertGreater(self.replica.sync(), 0)
+        self.assertEqual(self.replica.get_book(book.id), book)
+        self.assertEqual(
+            self.replica.get_book(1).status, Status.BORROWED.value
+        )
+        with self.assertRaises(ValueError):
+            self.replica.get_book(2)
+        self.assertEqual(
+            [book.id for book in self.replica.get_sorted_books("title")],
+            [book.id, 1],
+        )
+        self.assertEqual(
+            self.replica.search_book("author", "булгаков"), [book]
+        )
+
+    def test_replica_is_read_only(self):
+        """Тест: Реплика не изменяет каталог."""
+        with self.assertRaises(ValueError):
+            self.replica.add_book("Мастер и Маргарита", "Булгаков", 1967)
+        with self.assertRaises(ValueError):
+            self.replica.delete_book(1)
+        with self.assertRaises(ValueError):
+            self.replica.update_book_status(1, Status.BORROWED.value)
+
+    def test_replication_lag(self):
+        """Тест: Отставание реплики в записях журнала и секундах."""
+        self.assertEqual(self.replica.replication_lag()["records"], 0)
+        self.primary.add_book("Мастер и Маргарита", "Булгаков", 1967)
+        lag = self.replica.replication_lag()
+        # Запись о книге и отметка о сохранении каталога
+        self.assertEqual(lag["records"], 2)
+        self.assertGreaterEqual(lag["seconds"], 0)
+        self.replica.sync()
+        lag = self.replica.replication_lag()
+        self.assertEqual(lag["records"], 0)
+        self.assertEqual(lag["seq"], lag["primary_seq"])
+
+    def test_new_changelog_reloads_catalog(self):
+        """Тест: После нового журнала реплика загружает каталог заново."""
+        self.primary.changelog_limit = 1
+        first = self.primary.add_book("Мастер и Маргарита", "Булгаков", 1967)
+        second = self.primary.add_book("Белая гвардия", "Булгаков", 1925)
+        self.replica.sync()
+        self.assertEqual(self.replica.get_book(first.id), first)
+        self.assertEqual(self.replica.get_book(second.id), second)
+        self.assertEqual(self.replica.replication_lag()["records"], 0)
+
+    def test_lag_across_longer_new_changelog(self):
+        """
+        Тест: Реплика, отставшая на смену журнала, загружает каталог
+        заново, даже если новый журнал длиннее прочитанной части старого.
+        """
+        self.replica.sync()
+        self.primary.changelog_limit = 2
+        self.primary.add_book("Мастер и Маргарита", "Булгаков", 1967)
+        self.replica.sync()
+        books = [
+            self.primary.add_book(f"Длинное название {n} " * 20, "Автор", 2000)
+            for n in range(2)
+        ]
+        lag = self.replica.replication_lag()
+        self.assertGreater(lag["records"], 0)
+        self.replica.sync()
+        for book in books:
+            self.assertEqual(self.replica.get_book(book.id), book)
+        self.assertEqual(self.replica.replication_lag()["records"], 0)
+
+    def test_replica_follows_loans(self):
+        """Тест: Реплика получает выдачи книг и их возврат."""
+        self.primary.update_book_status(1, Status.BORROWED.value, "Читатель")
+        self.replica.sync()
+        self.assertEqual(self.replica.get_loan(1), self.primary.get_loan(1))
+        self.assertEqual(
+            [loan.book_id for loan in self.replica.due_loans(30)], [1]
+        )
+        self.primary.update_book_status(1, Status.AVAILABLE.value)
+        self.replica.sync()
+        self.assertIsNone(self.replica.get_loan(1))
+        self.assertEqual(self.replica.due_loans(30), [])
+
+    def test_reload_keeps_loans(self):
+        """Тест: После нового журнала реплика берет выдачи из файла."""
+        self.primary.changelog_limit = 1
+        self.primary.update_book_status(1, Status.BORROWED.value, "Читатель")
+        self.primary.update_book_status(2, Status.BORROWED.value, "Читатель")
+        self.replica.sync()
+        self.assertEqual(
+            [loan.book_id for loan in self.replica.due_loans(30)], [1, 2]
+        )
+
+    def test_reload_applies_status_changes(self):
+        """Тест: После нового журнала реплика видит новый статус книг."""
+        self.primary.changelog_limit = 1
+        self.replica.get_sorted_books("year")
+        for id in (1, 2):
+            self.primary.update_book_status(id, Status.BORROWED.value)
+        self.replica.sync()
+        for id in (1, 2):
+            with self.subTest(id=id):
+                self.assertEqual(
+                    self.replica.get_book(id).status, Status.BORROWED.value
+                )
+        self.assertEqual(
+            [book.id for book in self.replica.get_sorted_books("year")],
+            [1, 2],
+        )
+
+    def test_reload_after_all_books_deleted(self):
+        """Тест: После удаления всех книг реплика пуста."""
+        self.primary.changelog_limit = 1
+        for id in (1, 2):
+            self.primary.delete_book(id)
+        self.replica.sync()
+        self.assertEqual(self.replica.get_books(), [])
+        self.assertEqual(self.replica.search_book("year", 1949), [])
+        with self.assertRaises(ValueError):
+            self.replica.get_book(1)
+
+    def test_unsaved_changes_are_recovered(self):
+        """Тест: Изменения из журнала, не попавшие в каталог, применяются."""
+        self.primary._save_depth += 1
+        book = self.primary.add_book("Мастер и Маргарита", "Булгаков", 1967)
+        self.assertEqual(len(self.file_manager.load()), 2)
+        self.replica.sync()
+        self.assertEqual(self.replica.get_book(book.id), book)
+        library = LibraryManager(
+            Book, JsonFileManager(self.file_path), publish_changes=True
+        )
+        self.assertEqual(library.get_book(book.id), book)
+        self.assertIn(book.to_dict(), self.file_manager.load())
+
+    def test_recovered_delete_removes_loan(self):
+        """Тест: Восстановленное удаление книги удаляет и её выдачу."""
+        self.primary.update_book_status(1, Status.BORROWED.value, "Читатель")
+        self.primary._save_depth += 1
+        self.primary.delete_book(1)
+        library = LibraryManager(
+            Book, JsonFileManager(self.file_path), publish_changes=True
+        )
+        self.assertIsNone(library.get_loan(1))
+        self.assertEqual(library.due_loans(30), [])
+        self.assertEqual(self.file_manager.load_loans(), [])
+
+    def test_incomplete_record_is_not_read(self):
+        """Тест: Недописанная строка журнала не читается."""
+        with self.file_manager.changes_filepath.open("ab") as file:
+            file.write(b'{"seq": 1, "op": "delete"')
+        header, records, offset = self.file_manager.read_changes()
+        self.assertIsNotNone(header)
+        self.assertEqual(records, [])
+        self.assertEqual(self.replica.sync(), 0)
+        self.assertEqual(self.file_manager.read_changes(offset)[1], [])
+
+    def test_replicas_in_other_processes(self):
+        """Тест: Основной процесс и реплика в отдельных процессах."""
+        responses = self.run_main(
+            "add", "Мастер и Маргарита", "Булгаков", "1967"
+        )
+        book = responses[0]["result"]
+        self.replica.sync()
+        self.assertEqual(self.replica.get_book(book["id"]).to_dict(), book)
+        responses = self.run_main("--replica", "search", "author", "Булгаков")
+        self.assertEqual(responses[0]["result"], [book])
+        responses = self.run_main("--replica", "lag")
+        self.assertEqual(responses[0]["result"]["records"], 0)
+        responses = self.run_main("--replica", "delete", "1")
+        self.assertFalse(responses[0]["ok"])
+
+
+class TestColumnarReplicaLibraryManager(TestReplicaLibraryManager):
+    """Тестирование реплик с колоночным хранилищем книг."""
+
+    store_class = ColumnarBookStore
@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+from books import Book, Status, normalize_text
+from stores import ColumnarBookStore, DictBookStore
+
+
+class TestBookStores(TestCase):
+    """Тестирование хранилищ книг."""
+
+    def setUp(self):
+        self.books = [
+            Book(id=1, title="Война и мир", author="Лев Толстой", year=1869),
+            Book(
+                id=2,
+                title="Анна Каренина",
+                author="Лев Толстой",
+                year=1878,
+                status=Status.BORROWED.value,
+            ),
+            Book(id=4, title="Идиот", author="Фёдор Достоевский", year=1869),
+        ]
+
+    def make_stores(self):
+        items = [(book.id, book) for book in self.books]
+        return DictBookStore(items), ColumnarBookStore(items)
+
+    def test_mapping_interface(self):
+        """Тест: Хранилища ведут себя как словарь книг по id."""
+        for store in self.make_stores():
+            with self.subTest(store=type(store).__name__):
+                self.assertEqual(len(store), 3)
+                self.assertEqual(list(store), [1, 2, 4])
+                self.assertIn(2, store)
+                self.assertNotIn(3, store)
+                self.assertEqual(store[4], self.books[2])
+                self.assertEqual(store[4].author_key, "федор достоевский")
+                self.assertIsNone(store.get(3))
+                self.assertEqual(store.pop(2).title, "Анна Каренина")
+                self.assertEqual(
+                    [book.id for book in store.values()], [1, 4]
+                )
+
+    def test_search(self):
+        """Тест: Поиск по колонкам совпадает с поиском по объектам."""
+        queries = (
+            ("author", normalize_text("толстой")),
+            ("title", normalize_text("И")),
+            ("year", 1869),
+            ("year", "1869"),
+            ("status", Status.BORROWED.value),
+        )
+        dict_store, columnar_store = self.make_stores()
+        for field_name, query in queries:
+            with self.subTest(field=field_name, query=query):
+                self.assertEqual(
+                    list(columnar_store.search(field_name, query)),
+                    list(dict_store.search(field_name, query)),
+                )
+
+    def test_columnar_update_and_reinsert(self):
+        """Тест: Колоночное хранилище обновляет и восстанавливает записи."""
+        store = ColumnarBookStore((book.id, book) for book in self.books)
+        book = store[1]
+        book.status = Status.BORROWED.value
+        self.assertEqual(store[1].status, Status.AVAILABLE.value)
+        store[1] = book
+        self.assertEqual(store[1].status, Status.BORROWED.value)
+        del store[2]
+        self.assertNotIn(2, store)
+        store[2] = self.books[1]
+        store[3] = Book(id=3, title="Бесы", author="Автор", year=1872)
+        self.assertEqual(sorted(store), [1, 2, 3, 4])
+        self.assertEqual(store[3].title, "Бесы")
+        with self.assertRaises(KeyError):
+            del store[10]
+
+    def test_columnar_compaction(self):
+        """Тест: После массового удаления хранилище уплотняется."""
+        store = ColumnarBookStore(
+            (id, Book(id=id, title=f"Книга {id}", author="Автор", year=2000))
+            for id in range(1, 3001)
+        )
+        for id in range(1, 2901):
+            del store[id]
+        self.assertEqual(len(store), 100)
+        self.assertLess(len(store._ids), 3000)
+        self.assertEqual(store[3000].title, "Книга 3000")